@@ -1,5 +1,7 @@
 from benfordslaw.benfordslaw import benfordslaw
 from benfordslaw.benfordslaw import compute_excess_mad
+from benfordslaw.benfordslaw import compute_excess_mad_batch
+from benfordslaw.benfordslaw import DigitCounts
 import logging
 
 __author__ = 'Erdogan Tasksen'
@@ -58,6 +60,10 @@ Quick Excess MAD Computation
 >>> from benfordslaw import compute_excess_mad
 >>> result = compute_excess_mad(X, pos='first_two')
 >>> print(f"Excess MAD: {result['excess_mad']}")
+>>> #
+>>> # Excess MAD for every column of a table
+>>> from benfordslaw import compute_excess_mad_batch
+>>> results = compute_excess_mad_batch(df, pos='first_two')
 
 References
 ----------
@@ -0,0 +1,9 @@
+"""Benchmarks for benfordslaw.
+
+Run all benchmarks and compare against the stored baseline with::
+
+    python -m benfordslaw.benchmarks
+
+See ``python -m benfordslaw.benchmarks --help`` for the options.
+
+"""
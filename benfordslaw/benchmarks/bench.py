@@ -0,0 +1,317 @@
+"""Benchmarks for the digit counters, the fit and the plot of benfordslaw.
+
+ Name        : bench.py
+ Author      : E.Taskesen
+ Contact     : erdogant@gmail.com
+ github      : github.com/erdogant/benfordslaw.py
+ Licence     : MIT
+
+The data is generated offline and seeded. The string based digit extraction (get_digits_str) is the
+reference for the speedup of the arithmetic extraction (count_digit), it only runs up to 1e6 values.
+The import of benfordslaw is timed in a fresh interpreter, so that a heavy import at module level shows
+up as regression. Every benchmark records the best wall-clock time over a number of repeats, the
+throughput in values per second and the peak memory that is allocated during one call (traced with
+tracemalloc, numpy reports its allocations to tracemalloc). The results are stored as JSON and compared
+with a baseline of the same machine, by default benfordslaw_baseline.json in the working directory::
+
+    python -m benfordslaw.benchmarks --save                # Store the baseline
+    python -m benfordslaw.benchmarks                       # Compare with the baseline
+    python -m benfordslaw.benchmarks --sizes 1e3 1e8 --filter count
+
+"""
+import argparse
+import datetime
+import gc
+import json
+import logging
+import os
+import platform
+import re
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+import numpy as np
+import pandas as pd
+
+from benfordslaw import benfordslaw, compute_excess_mad
+from benfordslaw.benfordslaw import _count_digit, _count_first_two_digits
+from benfordslaw.simulate import generate
+
+# In the working directory, the installed package directory may be read-only or shared
+BASELINE = 'benfordslaw_baseline.json'
+SIZES = [1e3, 1e4, 1e5, 1e6]
+# The pure Python references only run up to this size, 1e8 values take hours
+MAX_REFERENCE_SIZE = 1e6
+METHODS = ['chi2', 'ks', 'kuiper', 'mad', None]
+POSITIONS = [1, 2, -1, 'first_two']
+
+
+# %% Data
+def make_data(kind, size, random_state=0):
+    """Generate synthetic data.
+
+    Parameters
+    ----------
+    kind : str
+        'benford' : Floats of which the log10 is uniformly distributed, these follow Benford's law for every position.
+        'uniform' : Integers that are uniformly distributed in [1, 1e6) and do not follow Benford's law.
+    size : int
+        Number of values.
+    random_state : int, (default: 0)
+        Seed.
+
+    Returns
+    -------
+    X : ndarray
+
+    """
+    if kind == 'benford':
+        return generate(int(size), low=1, high=1e9, random_state=random_state)
+    elif kind == 'uniform':
+        return np.random.default_rng(random_state).integers(1, 1000000, size=int(size))
+    raise ValueError("kind must be 'benford' or 'uniform'")
+
+
+# %% Benchmarks
+def _fit(X, method, pos):
+    return benfordslaw(method=method, pos=pos, verbose='error').fit(X)
+
+
+def _plot(bl):
+    import matplotlib.pyplot as plt
+    fig, _ = bl.plot(show=False)
+    plt.close(fig)
+
+
+def _plot_batch(bl, path):
+    bl.plot_batch(path)
+
+
+def _import():
+    """Import benfordslaw in a fresh interpreter, the time includes the start of the interpreter."""
+    # Import the same package as this process, also from a checkout
+    cwd = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    subprocess.run([sys.executable, '-c', 'import benfordslaw'], cwd=cwd, check=True)
+
+
+def _get_digits_str(X, d):
+    """String based digit extraction of integers, the reference for the arithmetic extraction."""
+    digits = np.full(X.shape, -1, dtype=np.int64)
+    Iloc = X >= 10 ** (d - 1)
+    digits[Iloc] = [int(str(x)[d - 1]) for x in X[Iloc]]
+    return digits
+
+
+def get_benchmarks(X, kind):
+    """Return the benchmarks on data X as a dict of {name: function}."""
+    benchmarks = {
+        f'count_digit[pos=1,{kind}]': lambda: _count_digit(X, 1, range(1, 10)),
+        f'count_digit[pos=2,{kind}]': lambda: _count_digit(X, 2, range(10)),
+        f'count_digit[pos=-1,{kind}]': lambda: _count_digit(X, -1, range(10)),
+        f'count_first_two_digits[{kind}]': lambda: _count_first_two_digits(X),
+        f'compute_excess_mad[pos=first_two,{kind}]': lambda: compute_excess_mad(X, pos='first_two'),
+        f'compute_excess_mad[pos=1,{kind}]': lambda: compute_excess_mad(X, pos=1),
+    }
+    if kind == 'uniform' and len(X) <= MAX_REFERENCE_SIZE:
+        benchmarks[f'get_digits_str[pos=2,{kind}]'] = lambda: _get_digits_str(X, 2)
+    if kind == 'benford':
+        for pos in POSITIONS:
+            for method in METHODS:
+                benchmarks[f'fit[method={method},pos={pos}]'] = lambda method=method, pos=pos: _fit(X, method, pos)
+    return benchmarks
+
+
+def measure(func, repeat=3):
+    """Measure the best time of repeated calls and the peak memory of one call.
+
+    The first call is not timed.
+
+    Parameters
+    ----------
+    func : callable
+        Function without arguments.
+    repeat : int, (default: 3)
+        Number of timed calls.
+
+    Returns
+    -------
+    seconds : float
+        Best wall-clock time.
+    peak_memory : float
+        Peak traced memory in MB.
+
+    """
+    # Warm up, e.g. the lazy imports and the caches
+    func()
+    timings = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+
+    # Tracing slows down the Python code, so the memory is measured in a separate call
+    gc.collect()
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return min(timings), peak / 1e6
+
+
+def run(sizes=SIZES, repeat=3, pattern=None, verbose=True):
+    """Run the benchmarks.
+
+    Parameters
+    ----------
+    sizes : list of float, (default: [1e3, 1e4, 1e5, 1e6])
+        Number of values of the data.
+    repeat : int, (default: 3)
+        Number of timed calls per benchmark.
+    pattern : str, (default: None)
+        Only run the benchmarks of which the name matches the regular expression.
+    verbose : bool, (default: True)
+        Print every result.
+
+    Returns
+    -------
+    dict
+        meta : Description of the machine.
+        results : {'name@size': {'name', 'size', 'seconds', 'throughput', 'peak_memory_mb'}}
+
+    """
+    import matplotlib
+    matplotlib.use('Agg')
+    # compute_excess_mad() sets the verbosity to 'info', disable the logging instead
+    logging.disable(logging.INFO)
+
+    results = {}
+
+    def add(name, size, func):
+        if pattern is not None and not re.search(pattern, name):
+            return
+        seconds, peak_memory = measure(func, repeat=repeat)
+        results[f'{name}@{size:.0e}'] = {'name': name,
+                                         'size': size,
+                                         'seconds': seconds,
+                                         'throughput': size / seconds,
+                                         'peak_memory_mb': peak_memory,
+                                         }
+        if verbose:
+            print(f'{name:<45} {size:>9.0e} {seconds:>11.5f}s {size / seconds:>13.3e} values/s {peak_memory:>10.2f} MB')
+
+    try:
+        # The import time does not depend on the number of values
+        add('import', 1, _import)
+        for size in sorted(int(size) for size in sizes):
+            for kind in ['benford', 'uniform']:
+                X = make_data(kind, size)
+                for name, func in get_benchmarks(X, kind).items():
+                    add(name, size, func)
+                del X
+
+        # The plot does not depend on the number of values
+        bl = benfordslaw(verbose='error')
+        bl.fit(make_data('benford', 10000))
+        add('plot', 10000, lambda: _plot(bl))
+        # The charts of 20 groups in one PDF file, the size is the number of charts
+        X = make_data('benford', 20000)
+        bl.fit_groups(pd.DataFrame({'value': X, 'group': np.arange(len(X)) % 20}), value_col='value', by='group')
+        with tempfile.TemporaryDirectory() as tmpdir:
+            add('plot_batch[pdf]', 20, lambda: _plot_batch(bl, os.path.join(tmpdir, 'charts.pdf')))
+    finally:
+        logging.disable(logging.NOTSET)
+
+    return {'meta': get_meta(repeat), 'results': results}
+
+
+def get_meta(repeat):
+    """Describe the machine and the versions."""
+    return {'date': datetime.datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            'processor': platform.processor(),
+            'cpu_count': os.cpu_count(),
+            'repeat': repeat,
+            }
+
+
+def compare(results, baseline, tolerance=0.25):
+    """Compare the results with a baseline.
+
+    Parameters
+    ----------
+    results : dict
+        Output of run().
+    baseline : dict
+        Output of run() that is stored as baseline.
+    tolerance : float, (default: 0.25)
+        A benchmark regressed if it is more than this fraction slower, or uses more than this fraction of memory.
+
+    Returns
+    -------
+    list of str
+        Names of the regressed benchmarks.
+
+    """
+    regressions = []
+    print(f"\nCompared with the baseline of {baseline['meta']['date']} ({baseline['meta']['platform']})")
+    print(f"{'benchmark':<55} {'time':>8} {'memory':>8}")
+    for key, result in results['results'].items():
+        if key not in baseline['results']:
+            continue
+        ref = baseline['results'][key]
+        time_ratio = result['seconds'] / ref['seconds']
+        memory_ratio = result['peak_memory_mb'] / ref['peak_memory_mb'] if ref['peak_memory_mb'] > 0 else 1.0
+        regressed = time_ratio > 1 + tolerance or memory_ratio > 1 + tolerance
+        if regressed:
+            regressions.append(key)
+        print(f"{key:<55} {time_ratio:>7.2f}x {memory_ratio:>7.2f}x{'  REGRESSION' if regressed else ''}")
+    return regressions
+
+
+def main(argv=None):
+    """Command line interface, returns 1 if a benchmark regressed compared to the baseline."""
+    parser = argparse.ArgumentParser(prog='python -m benfordslaw.benchmarks', description='Benchmarks for benfordslaw.')
+    parser.add_argument('--sizes', type=float, nargs='+', default=SIZES, help='Number of values, e.g.: 1e3 1e8 (default: 1e3 1e4 1e5 1e6).')
+    parser.add_argument('--repeat', type=int, default=3, help='Number of timed calls per benchmark (default: 3).')
+    parser.add_argument('--filter', dest='pattern', default=None, help='Only run the benchmarks that match this regular expression.')
+    parser.add_argument('--baseline', default=BASELINE, help='JSON file with the baseline (default: %(default)s).')
+    parser.add_argument('--save', action='store_true', help='Store the results as baseline.')
+    parser.add_argument('--output', default=None, help='Also write the results to this JSON file.')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='Allowed fraction of slowdown or extra memory (default: 0.25).')
+    args = parser.parse_args(argv)
+
+    results = run(sizes=args.sizes, repeat=args.repeat, pattern=args.pattern)
+
+    if args.output is not None:
+        _write(results, args.output)
+    if args.save:
+        _write(results, args.baseline)
+        print(f'\nBaseline stored in {args.baseline}')
+        return 0
+    if not os.path.isfile(args.baseline):
+        print(f'\nNo baseline found at {args.baseline}. Store one with --save.')
+        return 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    regressions = compare(results, baseline, tolerance=args.tolerance)
+    if regressions:
+        print(f'\n{len(regressions)} benchmark(s) regressed more than {args.tolerance:.0%}.')
+        return 1
+    return 0
+
+
+def _write(results, path):
+    with open(path, 'w') as f:
+        json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
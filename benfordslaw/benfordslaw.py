@@ -7,23 +7,33 @@
  Licence     : MIT
 
 """
-import datazets as dz
 import numpy as np
-import pandas as pd
-from scipy.stats import chisquare
-from scipy.stats import ks_2samp
-from scipy.stats import combine_pvalues
-import matplotlib.pyplot as plt
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import nullcontext
+from functools import lru_cache, partial
+import hashlib
+import importlib.util
+import json
 import math
+import mmap
+import os
+import re
+import struct
+import sys
+import time
+import tracemalloc
 import logging
 
+# The heavy dependencies (datazets, matplotlib, scipy and pandas) are imported
+# in the functions that need them to keep "import benfordslaw" fast and headless.
+
 logger = logging.getLogger(__name__)
 
 # %% Class
 class benfordslaw:
     """Class benfordslaw."""
 
-    def __init__(self, alpha: float = 0.05, method: str = 'chi2', pos: (int, str) = 1, verbose: [str, int] = 'info',):
+    def __init__(self, alpha: float = 0.05, method: str = 'chi2', pos: (int, str) = 1, verbose: [str, int] = 'info', n_simulations: int = None, random_state: int = None, n_threads: int = 1, profile: (bool, str) = False, metrics=None, normalize: bool = False):
         """Initialize benfordslaw with user-defined parameters.
 
         Constants for Excess MAD calculation.
@@ -39,7 +49,8 @@ class benfordslaw:
             Only used to print message about statistical significant.
         method : string, (Default: 'chi2').
             * 'chi2' : Chi-square test
-            * 'ks' : Kolmogorov-Smirnov test
+            * 'ks' : Discrete Kolmogorov-Smirnov test on the cumulative digit proportions
+            * 'kuiper' : Discrete Kuiper test on the cumulative digit proportions
             * 'mad' : Mean Absolute Deviation with Excess MAD adjustment (recommended for fraud detection)
             * None : Combined p-values based on Fisher's method
         pos : int or str [-9,..,9] or 'first_two', (default: 1).
@@ -58,6 +69,29 @@ class benfordslaw:
             - 20, 'info' : info level and above.
             - 30, 'warning' : warning level and above.
             - 50, 'critical' : critical level and above.
+        n_simulations : int, (default: None)
+            Number of Monte-Carlo simulations for the P-values. None uses the asymptotic P-values.
+            The test statistic is compared to its distribution in multinomial samples of the same
+            size drawn from the Benford distribution, which is reliable for small N and for the
+            90 categories of the first-two-digits test. For the 'mad' method, the P-value of the MAD is reported.
+            The simulated distributions are cached per (pos, N), so groups of the same size reuse them.
+        random_state : int, (default: None)
+            Seed for the Monte-Carlo simulations.
+        n_threads : int, (default: 1)
+            Number of threads that draw the Monte-Carlo simulations. The outcome does not depend on the number of threads.
+        profile : bool or str, (default: False)
+            Record the wall time of each stage of :func:`fit` in ``results['timings']``:
+            'convert' (input conversion), 'extract' (digit extraction), 'count', 'statistics', 'test' and 'logging'.
+            * True : wall time in seconds.
+            * 'memory' : also the peak allocated bytes of each stage in ``results['allocated_bytes']``, traced with tracemalloc (slower).
+        metrics : callable, (default: None)
+            Sink that is called as metrics(stage, seconds, nbytes) for each stage after the fit (nbytes is None unless profile='memory').
+            Setting a sink enables the profiling.
+        normalize : bool, (default: False)
+            Use the significant digits of the absolute values: every finite nonzero value is scaled into [1, 10)
+            before the leading digits are extracted, e.g. 0.00437 and -4370 both have first digit 4 and second digit 3.
+            By default, the digits of the integer part are used and values below 1 (or below 10 for 'first_two') are ignored.
+            Not used for the last digits (negative pos). Supports the positions up to 15, the precision of float64.
 
         References
         ----------
@@ -72,39 +106,38 @@ class benfordslaw:
         self.alpha = alpha
         self.method = method
         self.pos = pos
-        self.EXCESS_MAD_CONSTANTS = {
-            'first_two': 158.8,  # First-two-digits test (90 categories, k=10..99)
-            1: 21.27,            # First digit test (9 categories, k=1..9)
-            2: 30.30,            # Second digit test (10 categories, k=0..9)
-            3: 31.83,            # Third digit test (10 categories, approximately uniform)
-        }
+        self.n_simulations = n_simulations
+        self.random_state = random_state
+        self.n_threads = n_threads
+        self.profile = profile
+        self.metrics = metrics
+        self.normalize = normalize
+        self._profiler = None
+        # Constants for Excess MAD, derived from the (cached) Benford distributions
+        self.EXCESS_MAD_CONSTANTS = dict(_EXCESS_MAD_CONSTANTS)
         self.verbose = verbose
+        # Running totals of the empirical digit counts (see partial_fit)
+        self.counts_emp = None
+        # Number of text values that could not be parsed as number
+        self.n_rejected = 0
 
-        # Benford's Law percentage-distribution for leading digits
-        if pos == 'first_two':
-            # First-two-digits test: 90 categories (10-99)
-            # Probabilities from Benford's Law: log10(1 + 1/k) for k=10..99
-            self.leading_digits = np.array([math.log(1 + (1 / k), 10) for k in range(10, 100)]) * 100
-            self.digit_range = range(10, 100)
-        elif pos == 1:
-            self.leading_digits = np.array(list(map(lambda x: math.log(1 + (1 / x), 10), np.arange(1, 10)))) * 100
-            self.digit_range = range(1, 10)
-        elif pos == 2:
-            self.leading_digits = [12, 11.4, 10.9, 10.4, 10, 9.7, 9.3, 9, 8.8, 8.5]
-            self.digit_range = range(0, 10)
-        elif pos == 3:
-            self.leading_digits = [10.2, 10.1, 10.1, 10.1, 10.0, 10.0, 9.9, 9.9, 9.9, 9.8]
-            self.digit_range = range(0, 10)
-        elif pos == 0:
+        if method not in ['chi2', 'ks', 'kuiper', 'mad', 'P_ensemble', None]:
+            logger.error(f"method {method} is not supported")
+            raise ValueError(f"method {method} is not supported")
+
+        # Benford's Law percentage-distribution for the digit position
+        if pos == 0:
             logger.error("There is no leading digit distribution for the 0 digit!")
             raise ValueError("There is no leading digit distribution for the 0 digit!")
-        elif isinstance(pos, int) and (pos > 3 or pos < 0):
-            logger.info(f'[benfordslaw] >The is no leading digit distribution explicitly specified for digit [{pos}] and therefore the Uniform distribution is used instead.')
-            # Approximation, near-uniform distribution
-            self.leading_digits = [10.0] * 10
-            self.digit_range = range(0, 10)
-
-    def fit(self, X):
+        if normalize and isinstance(pos, (int, np.integer)) and pos > _MAX_SIGNIFICANT_DIGITS:
+            logger.error(f"normalize=True supports the positions up to {_MAX_SIGNIFICANT_DIGITS}, the precision of float64.")
+            raise ValueError(f"normalize=True supports the positions up to {_MAX_SIGNIFICANT_DIGITS}, the precision of float64.")
+        self.digit_range = _get_digit_range(pos)
+        self.leading_digits = _BENFORD_DISTRIBUTIONS[pos]
+        if isinstance(pos, (int, np.integer)) and pos < 0:
+            logger.info(f'[benfordslaw] >The is no leading digit distribution for the last digit [{pos}] and therefore the Uniform distribution is used instead.')
+
+    def fit(self, X, dtype=None):
         """Test if an empirical (observed) distribution significantly differs from a theoretical (expected, Benfords) distribution.
 
         The law states that in many naturally occurring collections of numbers, the leading significant digit is likely to be small.
@@ -120,8 +153,17 @@ class benfordslaw:
 
         Parameters
         ----------
-        X : list or numpy array
-            Input data.
+        X : list, numpy array, np.memmap, pd.Series, pd.DataFrame, pyarrow Array, ChunkedArray or Table, polars Series or DataFrame, or str
+            Input data. A path to a .npy file or a raw binary file is memory-mapped
+            and processed in windows without reading the whole file into memory.
+            Series and the columns of a DataFrame are read without copying; the columns
+            of a DataFrame are pooled into one test (see :func:`fit_columns` for a test per column).
+            Arrow and Polars data is read chunk by chunk from the Arrow buffers.
+            Text such as "$ 1,234.56", "1 234" or "(12.50)" is parsed as number, with '.' as
+            decimal point. Text that is no number (e.g. "n/a") is counted in n_rejected, as is negative
+            text such as "(12.50)" unless normalize=True.
+        dtype : str or np.dtype, (default: None)
+            Data type of a raw binary file (e.g. 'int64' or 'float64'). Not used for other input.
 
         Examples
         --------
@@ -187,6 +229,13 @@ class benfordslaw:
                 'acceptable conformity', 'marginally acceptable conformity', or 'nonconforming').
             N : int
                 Number of observations used in the analysis.
+            n_rejected : int
+                Number of text values that could not be parsed as number (e.g. "n/a"), or that are
+                negative and have no digits without normalize.
+            timings : dict
+                Wall time in seconds of each stage (only if profile is enabled).
+            allocated_bytes : dict
+                Peak allocated bytes of each stage (only if profile='memory').
 
 
         References
@@ -197,52 +246,164 @@ class benfordslaw:
           Fraud Detection. Hoboken, NJ: John Wiley & Sons.
 
         """
+        self.counts_emp = None
+        self._profiler = None
+        profiler = self._get_profiler()
+        with _stage(profiler, 'logging'):
+            logger.info(f"Analyzing digit position: {self.pos}")
         # Make distribution first digits
-        logger.info(f"Analyzing digit position: {self.pos}")
-        self.results = {}
-        # Convert pandas dataframe to numpy array
-        if isinstance(X, pd.DataFrame): X = X.values.ravel()
-        # Count digit based on position type
-        if self.pos == 'first_two':
-            counts_emp, percentage_emp, total_count, digit = _count_first_two_digits(X)
+        self.partial_fit(X, dtype=dtype)
+        return self.finalize()
+
+    def partial_fit(self, X, dtype=None):
+        """Add the digit counts of a chunk of data to the running totals.
+
+        The data does not need to be in memory at once: call partial_fit for each chunk
+        and run :func:`finalize` to compute the statistics on the running totals.
+        The running totals are stored in ``self.counts_emp`` and are reset by :func:`fit`.
+
+        Parameters
+        ----------
+        X : list, numpy array, np.memmap, pd.Series, pd.DataFrame, pyarrow Array, ChunkedArray or Table, polars Series or DataFrame, or str
+            Input data. A path to a .npy file or a raw binary file is memory-mapped
+            and processed in windows without reading the whole file into memory.
+            Series and the columns of a DataFrame are read without copying; the columns
+            of a DataFrame are pooled into one test (see :func:`fit_columns` for a test per column).
+            Arrow and Polars data is read chunk by chunk from the Arrow buffers.
+            Text such as "$ 1,234.56", "1 234" or "(12.50)" is parsed as number, with '.' as
+            decimal point. Text that is no number (e.g. "n/a") is counted in n_rejected, as is negative
+            text such as "(12.50)" unless normalize=True.
+        dtype : str or np.dtype, (default: None)
+            Data type of a raw binary file (e.g. 'int64' or 'float64'). Not used for other input.
+
+        Examples
+        --------
+        >>> # Import library
+        >>> from benfordslaw import benfordslaw
+        >>> import numpy as np
+        >>> #
+        >>> # Initialize
+        >>> bl = benfordslaw(method='chi2')
+        >>> #
+        >>> # Feed the data in chunks
+        >>> for _ in range(10):
+        >>>     bl.partial_fit(np.random.lognormal(mean=5, sigma=2, size=100000))
+        >>> #
+        >>> # Compute the statistics on the running totals
+        >>> results = bl.finalize()
+
+        Returns
+        -------
+        self : benfordslaw
+            The object with updated running totals.
+
+        """
+        profiler = self._get_profiler()
+        n_rejected = 0
+        if isinstance(X, DigitCounts):
+            if X.pos != self.pos:
+                raise ValueError(f'The digit counts are collected for pos={X.pos} but the model uses pos={self.pos}.')
+            counts_emp = X.counts
+        else:
+            if isinstance(X, (str, os.PathLike)):
+                with _stage(profiler, 'convert'):
+                    X = _load_array(X, dtype=dtype)
+            counts_emp, n_rejected = _count_position(X, self.pos, self.digit_range, profiler=profiler, normalize=self.normalize, return_rejected=True)
+
+        if self.counts_emp is None:
+            self.counts_emp = counts_emp.copy()
+            self.n_rejected = n_rejected
         else:
-            counts_emp, percentage_emp, total_count, digit = _count_digit(X, self.pos, self.digit_range)
-        # Expected counts
-        counts_exp = self._get_expected_counts(total_count)
+            self.counts_emp = self.counts_emp + counts_emp
+            self.n_rejected += n_rejected
+        return self
 
-        # Compute MAD and Excess MAD (always computed regardless of method)
-        mad, expected_mad, excess_mad, conformity = self._compute_mad_statistics(counts_emp, total_count)
+    def fit_counts(self, counts):
+        """Compute the statistics from digit counts that are collected elsewhere.
+
+        The digit counts can be collected per shard (e.g. in different processes) with
+        :class:`DigitCounts`, merged, and then tested without access to the raw values.
+
+        Parameters
+        ----------
+        counts : DigitCounts
+            Digit counts for the same digit position as the model.
+
+        Examples
+        --------
+        >>> from benfordslaw import benfordslaw, DigitCounts
+        >>> import numpy as np
+        >>> #
+        >>> # Count the shards (e.g. in worker processes)
+        >>> shards = [DigitCounts(pos=1).update(np.random.lognormal(mean=5, sigma=2, size=1000)) for _ in range(4)]
+        >>> #
+        >>> # Merge and test
+        >>> bl = benfordslaw(pos=1)
+        >>> results = bl.fit_counts(sum(shards))
+
+        Returns
+        -------
+        dict
+            Dictionary with the same keys as returned by :func:`fit`.
+
+        """
+        self.counts_emp = None
+        self._profiler = None
+        self.partial_fit(counts)
+        return self.finalize()
+
+    def get_counts(self):
+        """Return the running totals of the digit counts as :class:`DigitCounts`."""
+        return DigitCounts(pos=self.pos, counts=self.counts_emp)
+
+    def _get_profiler(self):
+        """Return the profiler of the current fit or None if the profiling is disabled."""
+        if self._profiler is None and (self.profile or self.metrics is not None):
+            self._profiler = _Profiler(memory=self.profile == 'memory')
+        return self._profiler
+
+    def finalize(self):
+        """Compute the statistics on the digit counts that are collected with :func:`partial_fit`.
+
+        Returns
+        -------
+        dict
+            Dictionary with the same keys as returned by :func:`fit`.
+
+        """
+        self.results = {}
+        profiler = self._get_profiler()
+        counts_emp = self.counts_emp
+        if counts_emp is None:
+            counts_emp = np.zeros(len(self.digit_range), dtype=np.int64)
+        digit = list(self.digit_range)
+        total_count = int(counts_emp.sum())
+        with _stage(profiler, 'statistics'):
+            percentage_emp = _counts_to_percentage(counts_emp, total_count)
+            # Expected counts
+            counts_exp = self._get_expected_counts(total_count)
+
+            # Compute MAD and Excess MAD (always computed regardless of method)
+            mad, expected_mad, excess_mad, conformity = self._compute_mad_statistics(counts_emp, total_count)
 
         # Compute Pvalues based on method
-        tstats, Praw = np.nan, np.nan
-        if total_count > 0:
-            if self.method == 'chi2':
-                try:
-                    tstats, Praw = chisquare(counts_emp, f_exp=counts_exp)
-                except:
-                    raise Exception('The relative tolerance of the chisquare test is not reached. Try using another method such as "method=ks". This is not a bug but a feature: "https://github.com/scipy/scipy/issues/13362" ')
-            elif self.method == 'ks':
-                tstats, Praw = ks_2samp(counts_emp, counts_exp)
-            elif self.method == 'mad':
-                # For MAD method, use excess_mad as the test statistic
-                # P-value is not applicable for MAD-based assessment
-                tstats = excess_mad
-                Praw = np.nan
-            else:
-                stats1, Praw1 = chisquare(counts_emp, f_exp=counts_exp)
-                tstats2, Praw2 = ks_2samp(counts_emp, counts_exp)
-                tstats, Praw = combine_pvalues([Praw1, Praw2], method='fisher')
-                self.method = 'P_ensemble'
+        with _stage(profiler, 'test'):
+            tstats, Praw = self._compute_pvalues(counts_emp, [counts_exp], excess_mad)
+            tstats, Praw = tstats[0], Praw[0]
+        if (self.method is None) and (total_count > 0): self.method = 'P_ensemble'
 
         # Show message
-        if self.method == 'mad':
-            logger.info(f"[{self.method}] {'No anomaly detected' if excess_mad <= 0 else 'Potential anomaly'}. Excess MAD={excess_mad} ({conformity})")
-        elif np.isnan(Praw):
-            logger.info("No data available for this position.")
-        elif (Praw <= self.alpha):
-            logger.info(f"[{self.method}] Anomaly detected! P={Praw}, Tstat={tstats}")
-        elif (Praw > self.alpha):
-            logger.info(f"[{self.method}] No anomaly detected. P={Praw}, Tstat={tstats}")
+        with _stage(profiler, 'logging'):
+            if self.n_rejected > 0:
+                logger.warning(f"{self.n_rejected} values could not be parsed as number (or are negative) and are ignored.")
+            if self.method == 'mad':
+                logger.info(f"[{self.method}] {'No anomaly detected' if excess_mad <= 0 else 'Potential anomaly'}. Excess MAD={excess_mad} ({conformity})")
+            elif np.isnan(Praw):
+                logger.info("No data available for this position.")
+            elif (Praw <= self.alpha):
+                logger.info(f"[{self.method}] Anomaly detected! P={Praw}, Tstat={tstats}")
+            elif (Praw > self.alpha):
+                logger.info(f"[{self.method}] No anomaly detected. P={Praw}, Tstat={tstats}")
         
         # Set bool based on selected method
         if self.method == 'mad':
@@ -252,6 +413,7 @@ class benfordslaw:
             
         # Store
         self.results['N'] = int(total_count)
+        self.results['n_rejected'] = int(self.n_rejected)
         self.results['P'] = Praw
         self.results['t'] = tstats
         self.results['percentage_emp'] = np.c_[digit, percentage_emp]
@@ -261,6 +423,14 @@ class benfordslaw:
         self.results['excess_mad'] = excess_mad
         self.results['conformity_mad'] = conformity
 
+        # Timings of the stages
+        if profiler is not None:
+            profiler.stop()
+            self.results['timings'] = dict(profiler.timings)
+            if profiler.memory: self.results['allocated_bytes'] = dict(profiler.allocated_bytes)
+            if self.metrics is not None: profiler.report(self.metrics)
+            self._profiler = None
+
         # return
         return self.results
 
@@ -297,53 +467,8 @@ class benfordslaw:
           Excess MAD in Benford's Law Research and Practice.
 
         """
-        if total_count == 0:
-            return np.nan, np.nan, np.nan, 'insufficient data'
-
-        # Calculate observed proportions
-        observed_proportions = np.array(counts_emp) / total_count
-
-        # Calculate expected proportions (from leading_digits, which are in percentages)
-        expected_proportions = np.array(self.leading_digits) / 100
-
-        # Calculate MAD: mean of absolute deviations
-        # MAD = (1/K) × Σ|Obs_k/N - Exp_k|
-        K = len(self.leading_digits)
-        mad = np.sum(np.abs(observed_proportions - expected_proportions)) / K
-
-        # Calculate Expected MAD for a pure Benford set
-        # E(MAD) ≈ 1 / √(C × N) where C depends on the digit test
-        C = self._get_excess_mad_constant()
-        expected_mad = 1.0 / math.sqrt(C * total_count)
-
-        # Calculate Excess MAD (the key contribution from Barney & Schulzke 2016)
-        excess_mad = mad - expected_mad
-
-        # Determine conformity based on Nigrini (2012) thresholds
-        # Thresholds are calibrated for the first-two-digits test
-        if self.pos == 'first_two':
-            # Original thresholds from Nigrini (2012) for first-two-digits test
-            if mad < 0.0012:
-                conformity = 'close conformity'
-            elif mad < 0.0018:
-                conformity = 'acceptable conformity'
-            elif mad < 0.0022:
-                conformity = 'marginally acceptable conformity'
-            else:
-                conformity = 'nonconforming'
-        else:
-            # For other digit tests, use Excess MAD-based interpretation
-            # Negative Excess MAD indicates better-than-expected conformity
-            if excess_mad < 0:
-                conformity = 'close conformity'
-            elif excess_mad < 0.001:
-                conformity = 'acceptable conformity'
-            elif excess_mad < 0.002:
-                conformity = 'marginally acceptable conformity'
-            else:
-                conformity = 'nonconforming'
-
-        return mad, expected_mad, excess_mad, conformity
+        mad, expected_mad, excess_mad, conformity = _mad_statistics(counts_emp, np.array(self.leading_digits) / 100, self._get_excess_mad_constant(), self.pos)
+        return mad[0], expected_mad[0], excess_mad[0], str(conformity[0])
 
     def _get_excess_mad_constant(self):
         """Get the constant C for Expected MAD calculation.
@@ -368,18 +493,332 @@ class benfordslaw:
           Excess MAD in Benford's Law Research and Practice.
 
         """
-        if self.pos == 'first_two':
-            return self.EXCESS_MAD_CONSTANTS['first_two']
-        elif self.pos in self.EXCESS_MAD_CONSTANTS:
+        if self.pos in self.EXCESS_MAD_CONSTANTS:
             return self.EXCESS_MAD_CONSTANTS[self.pos]
+        # Derive the constant from the Benford distribution of the digit position
+        return _excess_mad_constant(np.array(self.leading_digits) / 100)
+
+    def fit_groups(self, df, value_col, by, n_jobs=1):
+        """Test the digit distribution for every group in a DataFrame at once.
+
+        The digits are extracted once for the whole frame and counted per group with a single
+        2-D histogram on (group x digit). The statistics of all groups are then computed as
+        matrix operations. This is equivalent to a loop that calls :func:`fit` for each group
+        but without creating a new object and scanning the data for each group.
+
+        Parameters
+        ----------
+        df : pd.DataFrame, pyarrow Table or polars DataFrame
+            Input data. The value column of an Arrow Table or Polars DataFrame is read
+            chunk by chunk from the Arrow buffers.
+        value_col : str
+            Column with the values to be analyzed.
+        by : str or list of str
+            Column(s) to group on.
+        n_jobs : int, (default: 1)
+            Number of worker processes. The values and group codes are copied once into shared
+            memory; each worker counts a contiguous chunk of rows into a (groups x digits) matrix.
+            The matrices are summed and the statistics are computed once. -1 uses all CPUs.
+
+        Examples
+        --------
+        >>> # Import library
+        >>> from benfordslaw import benfordslaw
+        >>> #
+        >>> # Initialize
+        >>> bl = benfordslaw(method='chi2')
+        >>> #
+        >>> # Test every candidate
+        >>> df = bl.import_example(data='elections_usa')
+        >>> results = bl.fit_groups(df, value_col='votes', by='candidate')
+
+        Returns
+        -------
+        pd.DataFrame
+            One row per group with the columns N, P, t, P_significant, mad, expected_mad, excess_mad, conformity_mad
+            and n_rejected, the number of text values that could not be parsed as number (or are negative without normalize).
+            The digit counts per group are stored in ``self.counts_groups``.
+
+        """
+        import pandas as pd
+        logger.info(f"Analyzing digit position: {self.pos} for groups in: {by}")
+        if _is_polars(df, 'DataFrame'):
+            df = df.to_arrow()
+        group_codes, index = _get_group_codes(df, by)
+
+        if _is_pandas(df, 'DataFrame'):
+            X = _to_numpy(df[value_col])
+        else:
+            # The chunks of the Arrow column are converted one by one
+            X = df.column(value_col)
+        n_jobs = min(_get_n_jobs(n_jobs), max(len(group_codes), 1))
+        if n_jobs == 1:
+            # Extract the digits once and count per (group x digit)
+            counts_emp, n_rejected = _bincount_groups(X, group_codes, len(index), self.pos, self.digit_range, normalize=self.normalize, return_rejected=True)
+        else:
+            # Every worker counts a contiguous chunk of rows of the shared memory into a (groups x digits)
+            # matrix, the matrices are summed. Only the count matrices are sent back. The text is parsed
+            # here, the rejected values are NaN and are counted per group.
+            chunks = [_to_numeric(chunk, drop_negative=_drop_negative(self.pos, self.normalize), return_mask=True) for chunk in _get_chunks(X)]
+            rejected = np.concatenate([np.zeros(len(values), dtype=bool) if mask is None else mask for values, mask in chunks])
+            Iloc = rejected & (np.asarray(group_codes) >= 0)
+            n_rejected = np.bincount(np.asarray(group_codes)[Iloc], minlength=len(index))
+            X = np.concatenate([values for values, _ in chunks])
+            del chunks, rejected
+            values_shm, values_spec = _to_shared_memory(X)
+            codes_shm, codes_spec = _to_shared_memory(np.asarray(group_codes, dtype=np.int64))
+            del X
+            try:
+                worker = partial(_count_groups_worker, values_spec, codes_spec, n_groups=len(index), pos=self.pos, normalize=self.normalize)
+                with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+                    counts_emp = sum(executor.map(worker, *zip(*_get_row_chunks(len(group_codes), n_jobs))))
+            finally:
+                for shm in [values_shm, codes_shm]:
+                    shm.close()
+                    shm.unlink()
+        # Compute the statistics for all groups
+        results = self._compute_statistics(counts_emp)
+        results['n_rejected'] = _log_rejected(n_rejected)
+
+        self.counts_groups = pd.DataFrame(counts_emp, index=index, columns=list(self.digit_range))
+        return pd.DataFrame(results, index=index)
+
+    def fit_columns(self, df, columns=None):
+        """Test the digit distribution of every column in a DataFrame at once.
+
+        The columns are read through their underlying numpy arrays without copying the frame,
+        counted into a (columns x digits) count matrix, and the statistics of all columns are
+        computed as matrix operations. :func:`fit` on a DataFrame instead pools all columns into one test.
+
+        Parameters
+        ----------
+        df : pd.DataFrame, pyarrow Table, polars DataFrame, dict of arrays or 2-D array
+            Input data.
+        columns : list, (default: None)
+            Columns to be analyzed. None analyzes all columns.
+
+        Examples
+        --------
+        >>> # Import library
+        >>> from benfordslaw import benfordslaw
+        >>> import numpy as np
+        >>> import pandas as pd
+        >>> #
+        >>> df = pd.DataFrame({'revenue': np.random.lognormal(mean=8, sigma=2, size=10000), 'costs': np.random.randint(1000, 10000, size=10000)})
+        >>> bl = benfordslaw(pos='first_two', method='mad')
+        >>> results = bl.fit_columns(df)
+
+        Returns
+        -------
+        pd.DataFrame
+            One row per column with the same columns as :func:`fit_groups` and n_rejected,
+            the number of text values that could not be parsed as number (or are negative without normalize).
+            The digit counts per column are stored in ``self.counts_groups``.
+
+        """
+        import pandas as pd
+        if columns is not None: df = df[columns] if _is_pandas(df, 'DataFrame') else {col: _get_column(df, col) for col in columns}
+        names, values = _get_columns(df)
+        logger.info(f"Analyzing digit position: {self.pos} for {len(names)} columns")
+        counts_emp, n_rejected = _count_columns(values, self.pos, normalize=self.normalize, return_rejected=True)
+        results = self._compute_statistics(counts_emp)
+        results['n_rejected'] = _log_rejected(n_rejected)
+        self.counts_groups = pd.DataFrame(counts_emp, index=names, columns=list(self.digit_range))
+        return pd.DataFrame(results, index=names)
+
+    def fit_file(self, path, column, chunksize=1000000, by=None, **kwargs):
+        """Test the digit distribution of a column in a CSV or Parquet file that is read in chunks.
+
+        The file is streamed chunk by chunk and only the digit counts are accumulated,
+        so the peak memory depends on the chunksize and not on the size of the file.
+        CSV files are read with the chunked reader of pandas, Parquet files (.parquet, .pq)
+        with the record batches of pyarrow.
+
+        Parameters
+        ----------
+        path : str
+            Path to the CSV or Parquet file.
+        column : str
+            Column with the values to be analyzed.
+        chunksize : int, (default: 1000000)
+            Number of rows that are read at once.
+        by : str or list of str, (default: None)
+            Column(s) to group on. None tests the column as a whole.
+        **kwargs
+            Arguments that are passed to ``pd.read_csv`` (e.g. sep).
+
+        Examples
+        --------
+        >>> # Import library
+        >>> from benfordslaw import benfordslaw
+        >>> #
+        >>> # Initialize
+        >>> bl = benfordslaw(pos='first_two', method='mad')
+        >>> #
+        >>> # Test the amounts in a large general ledger extract
+        >>> results = bl.fit_file('ledger.csv', column='amount', chunksize=500000)
+        >>> #
+        >>> # Test the amounts per vendor
+        >>> results = bl.fit_file('ledger.parquet', column='amount', by='vendor')
+
+        Returns
+        -------
+        dict or pd.DataFrame
+            Dictionary with the same keys as returned by :func:`fit`,
+            or a DataFrame as returned by :func:`fit_groups` if ``by`` is specified.
+
+        """
+        import pandas as pd
+        logger.info(f"Analyzing digit position: {self.pos} for [{column}] in: {path}")
+        by_cols = [] if by is None else ([by] if isinstance(by, str) else list(by))
+        chunks = _read_file_chunks(path, [column] + by_cols, chunksize, **kwargs)
+
+        if by is None:
+            self.counts_emp = None
+            for chunk in chunks:
+                self.partial_fit(_get_column(chunk, column))
+            return self.finalize()
+
+        # Accumulate the counts per group, groups are added as they are encountered
+        K = len(self.digit_range)
+        groups, counts_emp, n_rejected = {}, np.zeros((0, K), dtype=np.int64), np.zeros(0, dtype=np.int64)
+        for chunk in chunks:
+            group_codes, keys = _get_group_codes(chunk, by)
+            index = np.array([groups.setdefault(key, len(groups)) for key in keys], dtype=np.int64)
+            if len(groups) > len(counts_emp):
+                counts_emp = np.vstack([counts_emp, np.zeros((len(groups) - len(counts_emp), K), dtype=np.int64)])
+                n_rejected = np.r_[n_rejected, np.zeros(len(groups) - len(n_rejected), dtype=np.int64)]
+            counts, rejected = _bincount_groups(_get_column(chunk, column), group_codes, len(keys), self.pos, self.digit_range, normalize=self.normalize, return_rejected=True)
+            counts_emp[index] += counts
+            n_rejected[index] += rejected
+
+        # Sort the groups in the same manner as fit_groups
+        if len(by_cols) == 1:
+            index = pd.Index(list(groups), name=by_cols[0])
+        else:
+            index = pd.MultiIndex.from_tuples(list(groups), names=by_cols)
+        order = index.argsort()
+        index, counts_emp = index[order], counts_emp[order]
+        results = self._compute_statistics(counts_emp)
+        results['n_rejected'] = _log_rejected(n_rejected[order])
+        self.counts_groups = pd.DataFrame(counts_emp, index=index, columns=list(self.digit_range))
+        return pd.DataFrame(results, index=index)
+
+    def fit_rolling(self, X, window, times=None):
+        """Compute the statistics over a sliding window of time-ordered data.
+
+        The digits are extracted once. For each digit category, the counts in the window
+        are obtained from cumulative counts: the digits that enter the window are added and
+        the digits that leave the window are subtracted. The cost is proportional to the
+        length of the data and does not depend on the window size.
+
+        Parameters
+        ----------
+        X : array-like
+            Input data in time order.
+        window : int or timedelta-like
+            Number of values in the window (the last N values), or, if times is given,
+            the time span of the window (the values in (t - window, t]).
+        times : array-like, (default: None)
+            Sorted timestamps (or numbers) of the values.
+
+        Examples
+        --------
+        >>> # Import library
+        >>> from benfordslaw import benfordslaw
+        >>> import numpy as np
+        >>> import pandas as pd
+        >>> #
+        >>> bl = benfordslaw(pos=1)
+        >>> X = np.random.lognormal(mean=5, sigma=2, size=100000)
+        >>> #
+        >>> # Statistics over the last 1000 transactions
+        >>> results = bl.fit_rolling(X, window=1000)
+        >>> #
+        >>> # Statistics over the last 10 minutes
+        >>> times = pd.date_range('2024-01-01', periods=len(X), freq='s')
+        >>> results = bl.fit_rolling(X, window=pd.Timedelta(minutes=10), times=times)
+
+        Returns
+        -------
+        pd.DataFrame
+            One row per value with the statistics of the window that ends at that value:
+            N, mad, expected_mad, excess_mad, conformity_mad, t (chi-square statistic) and P (chi-square P-value).
+
+        """
+        import pandas as pd
+        from scipy.stats import chi2
+        logger.info(f"Analyzing digit position: {self.pos} over a rolling window of {window}")
+        K = len(self.digit_range)
+        codes = _get_digit_codes(X, self.pos, self.digit_range, normalize=self.normalize)
+        n = len(codes)
+
+        # Start of the window for each value
+        stop = np.arange(1, n + 1)
+        if times is None:
+            start = np.maximum(stop - int(window), 0)
         else:
-            # For other positions, use an approximation based on the distribution
-            # C ≈ K² × π / 2 for approximately uniform distributions
-            K = len(self.leading_digits)
-            return K * K * math.pi / 2
+            times = pd.Index(times)
+            start = times.searchsorted(times - window, side='right')
+
+        def rolling_counts(Iloc):
+            # Counts in the window: the entering values are added and the leaving values are subtracted
+            cumsum = np.r_[0, np.cumsum(Iloc, dtype=np.int64)]
+            return cumsum[stop] - cumsum[start]
+
+        total_count = rolling_counts(codes < K)
+        expected_proportions = np.array(self.leading_digits) / 100
+        mad, tstats = np.zeros(n), np.zeros(n)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            for k in range(K):
+                counts = rolling_counts(codes == k)
+                mad += np.abs(counts / total_count - expected_proportions[k])
+                tstats += (counts - total_count * expected_proportions[k]) ** 2 / (total_count * expected_proportions[k])
+            mad = mad / K
+            expected_mad = 1.0 / np.sqrt(self._get_excess_mad_constant() * total_count)
+        Iloc = total_count == 0
+        mad[Iloc], expected_mad[Iloc], tstats[Iloc] = np.nan, np.nan, np.nan
+        excess_mad = mad - expected_mad
+
+        return pd.DataFrame({'N': total_count,
+                             'mad': mad,
+                             'expected_mad': expected_mad,
+                             'excess_mad': excess_mad,
+                             'conformity_mad': _get_conformity(mad, excess_mad, self.pos),
+                             't': tstats,
+                             'P': chi2.sf(tstats, K - 1),
+                             }, index=times)
+
+    def _compute_statistics(self, counts_emp):
+        """Compute the statistics for every row of a (groups x digits) count matrix."""
+        counts_emp = np.atleast_2d(counts_emp)
+        total_count = counts_emp.sum(axis=1)
+        counts_exp = self._get_expected_counts(total_count[:, None])
+        mad, expected_mad, excess_mad, conformity = _mad_statistics(counts_emp, np.array(self.leading_digits) / 100, self._get_excess_mad_constant(), self.pos)
+        tstats, Praw = self._compute_pvalues(counts_emp, counts_exp, excess_mad)
+        if self.method == 'mad':
+            P_significant = excess_mad > 0
+        else:
+            P_significant = Praw <= self.alpha
+
+        return {'N': total_count,
+                'P': Praw,
+                't': tstats,
+                'P_significant': P_significant,
+                'mad': mad,
+                'expected_mad': expected_mad,
+                'excess_mad': excess_mad,
+                'conformity_mad': conformity,
+                }
+
+    def _compute_pvalues(self, counts_emp, counts_exp, excess_mad):
+        """Compute the test statistics and P-values, with Monte-Carlo simulations if n_simulations is set."""
+        if self.n_simulations is None:
+            return _compute_pvalues(counts_emp, counts_exp, self.method, excess_mad)
+        return _simulate_pvalues(counts_emp, self.pos, self.method, excess_mad, self.n_simulations, self.random_state, self.n_threads)
 
     # Plot
-    def plot(self, title='', fontsize=16, barcolor='black', barwidth=0.3, label='Empirical distribution', figsize=(15, 8), grid=True):
+    def plot(self, title='', fontsize=16, barcolor='black', barwidth=0.3, label='Empirical distribution', figsize=(15, 8), grid=True, ax=None, show=True, savepath=None):
         """Make bar chart of observed vs expected digit frequency in percent.
 
         Parameters
@@ -394,75 +833,256 @@ class benfordslaw:
             Label of the figure.
         figsize : tuple, optional
             Figure size. The default is (15,8).
+        ax : matplotlib Axes, (default : None)
+            Axes to draw in. None creates a new figure.
+        show : bool, (default : True)
+            Show the figure with plt.show(). Use False for headless use (e.g. in scripts that only save the figure).
+        savepath : str, (default : None)
+            Save the figure to this file. The format follows from the extension (e.g. .png, .svg or .pdf).
 
         Returns
         -------
         tuple : fig, ax.
 
         """
-        data_percentage = self.results['percentage_emp']
-        x = data_percentage[:, 0]
-
+        import matplotlib.pyplot as plt
         # Make figures
-        fig, ax = plt.subplots(figsize=figsize)
-        # Plot Empirical percentages
-        rects1 = ax.bar(x, data_percentage[:, 1], width=barwidth, color=barcolor, alpha=0.8, label=label)
-
-        plt.plot(x, data_percentage[:, 1], color='black', linewidth=0.8)
-        # attach a text label above each bar displaying its height
-        for rect, perc in zip(rects1, data_percentage[:, 1]):
-            if not np.isnan(perc):
-                height = rect.get_height()
-                # Only show labels for first digit or first_two with limited labels
-                if self.pos != 'first_two':
-                    ax.text(rect.get_x() + rect.get_width() / 2, height, '{:0.1f}%'.format(height), ha='center', va='bottom', fontsize=13)
+        if ax is None:
+            fig, ax = plt.subplots(figsize=figsize)
+        else:
+            fig = ax.figure
 
-        # Plot expected benfords values
-        ax.scatter(x, self.leading_digits, s=150 if self.pos != 'first_two' else 30, c='red', zorder=2, label='Benfords distribution')
+        chart = _DigitPlot(ax, self, fontsize=fontsize, barcolor=barcolor, barwidth=barwidth, label=label, grid=grid)
+        chart.update(self.results['percentage_emp'][:, 1], self._get_plot_title(title, self.results))
 
-        # Build title based on method
-        if self.method == 'mad':
-            title = title + "\nExcess MAD=%g (%s)" % (self.results['excess_mad'], self.results['conformity_mad'])
-        elif not np.isnan(self.results['P']) and self.results['P'] <= self.alpha:
-            title = title + "\nAnomaly detected! P=%g, Tstat=%g" % (self.results['P'], self.results['t'])
-        elif not np.isnan(self.results['P']):
-            title = title + "\nNo anomaly detected. P=%g, Tstat=%g" % (self.results['P'], self.results['t'])
+        if savepath is not None:
+            fig.savefig(savepath)
+        if show:
+            plt.show()
+        return fig, ax
 
-        # Add MAD info to title if available
-        if 'mad' in self.results and self.method != 'mad':
-            title = title + "\nMAD=%g, Excess MAD=%g" % (self.results['mad'], self.results['excess_mad'])
+    def plot_batch(self, path, counts=None, titles=None, fontsize=16, barcolor='black', barwidth=0.3, label='Empirical distribution', figsize=(15, 8), grid=True, dpi=100):
+        """Save the bar charts of many groups without showing them.
 
-        # Add some text for labels, title and custom x-axis tick labels, etc.
-        ax.set_title(title, fontsize=fontsize)
-        ax.set_ylabel('Frequency (%)', fontsize=fontsize)
-        ax.set_xlabel('Digits', fontsize=fontsize)
+        One figure is drawn once and for every group only the heights of the bars, the labels and the title are
+        updated before the figure is written. The figure is not registered with pyplot, no window is opened and
+        nothing is left open afterwards. This makes it suitable for rendering thousands of charts for a report.
 
-        # Adjust x-axis for first_two digits test
-        if self.pos == 'first_two':
-            # Show fewer tick labels for readability
-            tick_positions = list(range(10, 100, 10))
-            ax.set_xticks(tick_positions)
-            ax.set_xticklabels(tick_positions, fontsize=fontsize - 2)
-        else:
-            ax.set_xticks(x.astype(int))
-            ax.set_xticklabels(x.astype(int), fontsize=fontsize)
+        Parameters
+        ----------
+        path : str
+            A .pdf file writes one page per group into a single PDF file. Otherwise the path must contain
+            '{}', which is replaced by the name of the group, e.g. 'charts/{}.png'. The index of the group
+            is appended to names that give the same file name (e.g. 'a/b' and 'a_b'). The format of
+            the files follows from the extension (e.g. .png, .svg or .pdf).
+        counts : pd.DataFrame or array-like, (default: None)
+            Digit counts with shape (groups x digits). None uses ``self.counts_groups`` of
+            :func:`fit_groups`, :func:`fit_columns` or :func:`fit_file`.
+        titles : list of str, (default: None)
+            Title per group. None uses the names of the groups (the index of counts).
+        dpi : int, (default: 100)
+            Resolution of the files in dots per inch.
+        fontsize, barcolor, barwidth, label, figsize, grid
+            See :func:`plot`.
 
-        if grid:
-            ax.grid(True, which='both', linestyle='--', linewidth=0.9, alpha=0.8)
+        Examples
+        --------
+        >>> # Import library
+        >>> from benfordslaw import benfordslaw
+        >>> #
+        >>> bl = benfordslaw(method='chi2')
+        >>> df = bl.import_example(data='elections_usa')
+        >>> results = bl.fit_groups(df, value_col='votes', by='candidate')
+        >>> #
+        >>> # All candidates in one PDF file
+        >>> bl.plot_batch('candidates.pdf')
+        >>> #
+        >>> # One PNG file per candidate
+        >>> paths = bl.plot_batch('charts/{}.png')
 
-        # Hide the right and top spines & add legend
-        ax.spines['right'].set_visible(False)
-        ax.spines['top'].set_visible(False)
-        ax.legend(prop={'size': 15}, frameon=False)
-        ax.legend()
+        Returns
+        -------
+        list of str
+            The files that are written.
 
-        plt.show()
-        return fig, ax
+        """
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        if counts is None:
+            if getattr(self, 'counts_groups', None) is None:
+                raise ValueError('No digit counts per group: run fit_groups, fit_columns or fit_file first, or provide counts.')
+            counts = self.counts_groups
+        names = list(counts.index) if _is_pandas(counts, 'DataFrame') else list(range(len(counts)))
+        counts = np.atleast_2d(np.asarray(counts, dtype=np.int64))
+        if titles is None: titles = [_to_label(name) for name in names]
+        multipage = '{}' not in str(path)
+        if multipage and not str(path).lower().endswith('.pdf'):
+            raise ValueError("The path must be a .pdf file or contain '{}' for the name of the group, e.g. 'charts/{}.png'.")
+
+        # Statistics and percentages of all groups at once
+        results = self._compute_statistics(counts)
+        total_count = counts.sum(axis=1, keepdims=True)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            percentage_emp = counts / total_count * 100
+
+        # One figure that is not managed by pyplot
+        fig = Figure(figsize=figsize, dpi=dpi)
+        FigureCanvasAgg(fig)
+        chart = _DigitPlot(fig.subplots(), self, fontsize=fontsize, barcolor=barcolor, barwidth=barwidth, label=label, grid=grid)
+
+        def draw(i):
+            chart.update(percentage_emp[i], self._get_plot_title(titles[i], {key: values[i] for key, values in results.items()}))
+
+        logger.info(f"Writing the charts of {len(counts)} groups to: {path}")
+        if multipage:
+            from matplotlib.backends.backend_pdf import PdfPages
+            with PdfPages(path) as pdf:
+                for i in range(len(counts)):
+                    draw(i)
+                    pdf.savefig(fig)
+            return [str(path)]
+
+        # Fast PNG compression, the encoding takes about as long as the drawing otherwise
+        kwargs = {'pil_kwargs': {'compress_level': 1}} if str(path).lower().endswith('.png') else {}
+        paths = [str(path).format(filename) for filename in _to_filenames(names)]
+        for i in range(len(names)):
+            draw(i)
+            fig.savefig(paths[i], **kwargs)
+        return paths
+
+    def plot_grid(self, results=None, ncols=5, counts=None, sort=True, barcolor='black', fontsize=10, figsize=None, show=True, savepath=None):
+        """Plot the empirical vs the Benford distribution of many groups as small multiples in one figure.
+
+        The axes have the same x- and y-axis, only the outer axes are labeled. The bars of every group
+        are drawn as one collection and the figure has a single legend. The groups are sorted on Excess MAD,
+        the largest deviation first.
 
-    def import_example(self, data='elections', url=None, sep=',', verbose='info'):
+        Parameters
+        ----------
+        results : pd.DataFrame, (default: None)
+            Output of :func:`fit_groups`, :func:`fit_columns` or :func:`fit_file` (with by), or a
+            selection of its rows. None computes the statistics from the counts.
+        ncols : int, (default: 5)
+            Number of columns of the grid.
+        counts : pd.DataFrame or array-like, (default: None)
+            Digit counts with shape (groups x digits) in the same order as results.
+            None uses ``self.counts_groups``.
+        sort : bool, (default: True)
+            Sort the groups on Excess MAD (descending). False keeps the order of the groups.
+        barcolor : tuple or string, (default : 'black')
+            Color of the bars.
+        fontsize : int, (default : 10)
+            Font size of the titles of the groups.
+        figsize : tuple, (default: None)
+            Figure size. None uses 3 by 2.2 inch per group.
+        show : bool, (default : True)
+            Show the figure with plt.show().
+        savepath : str, (default : None)
+            Save the figure to this file.
+
+        Examples
+        --------
+        >>> # Import library
+        >>> from benfordslaw import benfordslaw
+        >>> #
+        >>> bl = benfordslaw(method='chi2')
+        >>> df = bl.import_example(data='elections_usa')
+        >>> results = bl.fit_groups(df, value_col='votes', by='candidate')
+        >>> fig, axes = bl.plot_grid(results, ncols=4)
+
+        Returns
+        -------
+        tuple : fig, axes.
+
+        """
+        import matplotlib.pyplot as plt
+        from matplotlib.collections import PolyCollection
+        from matplotlib.ticker import MaxNLocator
+        if counts is None:
+            if getattr(self, 'counts_groups', None) is None:
+                raise ValueError('No digit counts per group: run fit_groups, fit_columns or fit_file first, or provide counts.')
+            counts = self.counts_groups
+        if _is_pandas(results, 'DataFrame') and _is_pandas(counts, 'DataFrame'):
+            # Only the groups in the results, e.g. a selection of the groups
+            counts = counts.loc[results.index]
+        names = list(counts.index) if _is_pandas(counts, 'DataFrame') else list(range(len(counts)))
+        counts = np.atleast_2d(np.asarray(counts, dtype=np.int64))
+        excess_mad = np.asarray(results['excess_mad'], dtype=float) if results is not None else self._compute_statistics(counts)['excess_mad']
+        if len(excess_mad) != len(counts):
+            raise ValueError(f'The results contain {len(excess_mad)} groups but the counts {len(counts)}.')
+
+        # Largest Excess MAD first, groups without observations last
+        order = np.argsort(-np.nan_to_num(excess_mad, nan=-np.inf), kind='stable') if sort else np.arange(len(counts))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            percentage_emp = counts / counts.sum(axis=1, keepdims=True) * 100
+
+        n = len(counts)
+        nrows = max(1, math.ceil(n / ncols))
+        fig, axes = plt.subplots(nrows, ncols, squeeze=False, figsize=figsize or (3 * ncols, 2.2 * nrows))
+
+        # The limits are set for every axes instead of sharing the axes: the shared axes of matplotlib
+        # and the autoscaling of every added artist take time in the square of the number of axes.
+        x = np.array(self.digit_range, dtype=float)
+        xlim = (x[0] - 1, x[-1] + 1)
+        ylim = (0, 1.05 * np.nanmax(np.r_[percentage_emp.ravel(), self.leading_digits]))
+        # Few ticks, every tick is a set of artists per axes
+        xticks = [x[0], x[len(x) // 2], x[-1]]
+        yticks = [tick for tick in MaxNLocator(nbins=3).tick_values(*ylim) if tick <= ylim[1]]
+
+        # The corners of all bars of a group: (digits x 4 corners x 2)
+        left, right, bottom = x - 0.4, x + 0.4, np.zeros_like(x)
+        for k, ax in enumerate(axes.flat):
+            if k >= n:
+                ax.set_axis_off()
+                continue
+            i = order[k]
+            height = np.nan_to_num(percentage_emp[i])
+            verts = np.stack([np.c_[left, bottom], np.c_[left, height], np.c_[right, height], np.c_[right, bottom]], axis=1)
+            ax.add_collection(PolyCollection(verts, facecolors=barcolor, edgecolors='none', alpha=0.8), autolim=False)
+            ax.plot(x, self.leading_digits, color='red', linewidth=1, scalex=False, scaley=False)
+            ax.set(xlim=xlim, ylim=ylim, xticks=xticks, yticks=yticks)
+            ax.set_title(f'{_to_label(names[i])}\nExcess MAD={excess_mad[i]:.3g}', fontsize=fontsize)
+            # Only the outer axes are labeled
+            bottom_row, first_col = k + ncols >= n, k % ncols == 0
+            ax.tick_params(labelsize=fontsize - 2, labelbottom=bottom_row, labelleft=first_col)
+            if bottom_row: ax.set_xlabel('Digits', fontsize=fontsize)
+            if first_col: ax.set_ylabel('Frequency (%)', fontsize=fontsize)
+
+        # A single legend for the figure
+        handles = [plt.Rectangle((0, 0), 1, 1, color=barcolor, alpha=0.8), plt.Line2D([0], [0], color='red')]
+        fig.legend(handles, ['Empirical distribution', 'Benfords distribution'], loc='upper center', ncol=2, frameon=False)
+        # Margins in inches for the labels, the titles and the legend
+        width, height = fig.get_size_inches()
+        fig.subplots_adjust(left=0.8 / width, right=1 - 0.2 / width, bottom=0.6 / height, top=1 - 0.9 / height, wspace=0.08, hspace=0.55)
+
+        if savepath is not None:
+            fig.savefig(savepath)
+        if show:
+            plt.show()
+        return fig, axes
+
+    def _get_plot_title(self, title, results):
+        """Return the title of the chart with the outcome of the test."""
+        # Build title based on method
+        if self.method == 'mad':
+            title = title + "\nExcess MAD=%g (%s)" % (results['excess_mad'], results['conformity_mad'])
+        elif not np.isnan(results['P']) and results['P'] <= self.alpha:
+            title = title + "\nAnomaly detected! P=%g, Tstat=%g" % (results['P'], results['t'])
+        elif not np.isnan(results['P']):
+            title = title + "\nNo anomaly detected. P=%g, Tstat=%g" % (results['P'], results['t'])
+
+        # Add MAD info to title if available
+        if 'mad' in results and self.method != 'mad':
+            title = title + "\nMAD=%g, Excess MAD=%g" % (results['mad'], results['excess_mad'])
+        return title
+
+    def import_example(self, data='elections', url=None, sep=',', verbose='info', cache=True, offline=None, cache_dir=None):
         """Import example dataset from github source.
 
         Import one of the few datasets from github source or specify your own download url link.
+        The dataset is stored in a local cache as a Parquet file (or as npz if pyarrow is not installed)
+        with its SHA-256 checksum. A next import reads the cached file if the checksum is valid,
+        without the network and without importing datazets.
 
         Parameters
         ----------
@@ -474,50 +1094,1148 @@ class benfordslaw:
             url link to to dataset.
         sep : Seperator (String)
             When using URL, seperate the input file based on this seperator.
+        cache : bool, (default: True)
+            Read the dataset from the cache and store downloaded datasets in the cache.
+        offline : bool, (default: None)
+            Only read from the cache, a dataset that is not cached raises FileNotFoundError.
+            None uses the environment variable BENFORDSLAW_OFFLINE (e.g. BENFORDSLAW_OFFLINE=1).
+        cache_dir : str, (default: None)
+            Directory of the cache. None uses the environment variable BENFORDSLAW_CACHE_DIR,
+            or ~/.cache/benfordslaw.
 
         Returns
         -------
         pd.DataFrame()
             Dataset containing mixed features.
 
+        Examples
+        --------
+        >>> # Import library
+        >>> from benfordslaw import benfordslaw
+        >>> bl = benfordslaw()
+        >>> #
+        >>> # Download once, then read from the cache
+        >>> df = bl.import_example(data='elections_usa')
+        >>> #
+        >>> # On a machine without network access, with a copy of the cache directory
+        >>> df = bl.import_example(data='elections_usa', offline=True, cache_dir='/data/benfordslaw_cache')
+
         References
         ----------
             * https://github.com/erdogant/datazets
 
         """
-
-        return dz.get(data=data, url=url, sep=sep, verbose=verbose)
+        if offline is None:
+            offline = os.environ.get('BENFORDSLAW_OFFLINE', '').lower() in ['1', 'true', 'yes']
+        path = _get_cache_path(data, url, sep, cache_dir) if (cache or offline) else None
+
+        if path is not None:
+            df = _read_cache(path)
+            if df is not None:
+                logger.info(f"Dataset [{data if url is None else url}] is read from the cache: {path}")
+                return df
+        if offline:
+            raise FileNotFoundError(f"Dataset [{data if url is None else url}] is not in the cache: {path}. Import it once with network access or copy the cache directory.")
+
+        import datazets as dz
+        df = dz.get(data=data, url=url, sep=sep, verbose=verbose)
+        if path is not None and df is not None:
+            _write_cache(df, path)
+        return df
 
     # Compute expected counts
     def _get_expected_counts(self, total_count):
-        """Return list of expected Benford's Law counts for total sample count."""
-        out = []
-        for p in self.leading_digits:
-            out.append((p * total_count / 100))
-        return out
+        """Return expected Benford's Law counts for total sample count (scalar or column vector)."""
+        return np.array(self.leading_digits) * total_count / 100
 
 
-# %% Counts and the frequencies in percentage for the first digit
-def _count_first_digit(data):
-    # Get only non-zero values
-    data = data[data >= 1]
+# %% Mergeable digit counts
+class DigitCounts:
+    """Digit counts for one digit position that can be merged and serialized.
 
-    # Get the first digits
-    first_digits = list(map(lambda x: int(str(x)[0]), data))
+    The counts can be collected per shard of the data (e.g. in worker processes),
+    merged with ``merge`` or ``+``, and shipped as a compact fixed-size binary
+    message instead of the raw values. Use :func:`benfordslaw.fit_counts` to
+    compute the statistics on the (merged) counts.
 
-    # Count occurences. Make sure every position is for [1-9]
-    empirical_counts = np.zeros(9)
-    digit = []
-    for i in range(1, 10):
-        empirical_counts[i - 1] = first_digits.count(i)
-        digit.append(i)
+    Parameters
+    ----------
+    pos : int or str [-9,..,9] or 'first_two', (default: 1).
+        Digit position to be analyzed. See benfordslaw class for options.
+    counts : array-like, (default: None)
+        Initial counts for each digit category. None starts with zero counts.
 
-    # Total amount
-    total_count = sum(empirical_counts)
-    # Make percentage
-    empirical_percentage = [(i / total_count) * 100 for i in empirical_counts]
-    # Return
-    return(empirical_counts, empirical_percentage, total_count, digit)
+    Examples
+    --------
+    >>> from benfordslaw import DigitCounts
+    >>> import numpy as np
+    >>> #
+    >>> counts1 = DigitCounts(pos=1).update(np.random.lognormal(mean=5, sigma=2, size=1000))
+    >>> counts2 = DigitCounts(pos=1).update(np.random.lognormal(mean=5, sigma=2, size=1000))
+    >>> #
+    >>> # Serialize and merge
+    >>> counts = DigitCounts.from_bytes(counts1.to_bytes()) + counts2
+    >>> print(counts.total)
+
+    """
+
+    # Header of the binary message: magic, digit position (0 encodes 'first_two'), number of categories
+    _HEADER = struct.Struct('<4sbH')
+    _MAGIC = b'BFLC'
+
+    def __init__(self, pos=1, counts=None):
+        self.pos = pos
+        self.digit_range = _get_digit_range(pos)
+        if counts is None:
+            counts = np.zeros(len(self.digit_range), dtype=np.int64)
+        counts = np.array(counts, dtype=np.int64)
+        if counts.shape != (len(self.digit_range),):
+            raise ValueError(f'Expected {len(self.digit_range)} counts for pos={pos} but got shape {counts.shape}.')
+        self.counts = counts
+
+    @property
+    def total(self):
+        """Total number of observations."""
+        return int(self.counts.sum())
+
+    def update(self, X, normalize=False):
+        """Add the digit counts of X and return self, normalize uses the significant digits (see benfordslaw)."""
+        self.counts += _count_position(X, self.pos, self.digit_range, normalize=normalize)
+        return self
+
+    def merge(self, other):
+        """Return new DigitCounts with the summed counts of self and other."""
+        if not isinstance(other, DigitCounts):
+            raise TypeError(f'Can not merge DigitCounts with {type(other).__name__}.')
+        if other.pos != self.pos:
+            raise ValueError(f'Can not merge digit counts of pos={self.pos} with pos={other.pos}.')
+        return DigitCounts(pos=self.pos, counts=self.counts + other.counts)
+
+    def __add__(self, other):
+        return self.merge(other)
+
+    def __radd__(self, other):
+        # Support the builtin sum() that starts with 0
+        if isinstance(other, int) and other == 0:
+            return DigitCounts(pos=self.pos, counts=self.counts)
+        return self.merge(other)
+
+    def __eq__(self, other):
+        return isinstance(other, DigitCounts) and other.pos == self.pos and np.array_equal(other.counts, self.counts)
+
+    def __repr__(self):
+        return f'DigitCounts(pos={self.pos!r}, total={self.total})'
+
+    def to_bytes(self):
+        """Serialize to bytes: a fixed-size header followed by the counts as little-endian int64."""
+        pos = 0 if self.pos == 'first_two' else self.pos
+        return self._HEADER.pack(self._MAGIC, pos, len(self.counts)) + self.counts.astype('<i8').tobytes()
+
+    @classmethod
+    def from_bytes(cls, data):
+        """Create DigitCounts from bytes that are created with :func:`to_bytes`."""
+        magic, pos, K = cls._HEADER.unpack_from(data)
+        if magic != cls._MAGIC:
+            raise ValueError('The data is not a serialized DigitCounts object.')
+        counts = np.frombuffer(data, dtype='<i8', count=K, offset=cls._HEADER.size)
+        return cls(pos='first_two' if pos == 0 else pos, counts=counts)
+
+
+# %% Plotting
+class _DigitPlot:
+    """Bar chart of the empirical vs the Benford distribution of which the bars are updated in place."""
+
+    def __init__(self, ax, model, fontsize=16, barcolor='black', barwidth=0.3, label='Empirical distribution', grid=True):
+        self.ax = ax
+        self.fontsize = fontsize
+        self.expected = np.asarray(model.leading_digits, dtype=float)
+        x = np.array(model.digit_range)
+
+        # Plot Empirical percentages, the heights are set by update()
+        self.rects = ax.bar(x, np.zeros(len(x)), width=barwidth, color=barcolor, alpha=0.8, label=label)
+        self.line, = ax.plot(x, np.zeros(len(x)), color='black', linewidth=0.8)
+        # Text labels above the bars, not for the first two digits
+        self.labels = ax.bar_label(self.rects, labels=[''] * len(x), fontsize=13) if model.pos != 'first_two' else []
+
+        # Plot expected benfords values
+        ax.scatter(x, self.expected, s=150 if model.pos != 'first_two' else 30, c='red', zorder=2, label='Benfords distribution')
+
+        # Add some text for labels and custom x-axis tick labels
+        ax.set_ylabel('Frequency (%)', fontsize=fontsize)
+        ax.set_xlabel('Digits', fontsize=fontsize)
+        if model.pos == 'first_two':
+            # Show fewer tick labels for readability
+            tick_positions = list(range(10, 100, 10))
+            ax.set_xticks(tick_positions)
+            ax.set_xticklabels(tick_positions, fontsize=fontsize - 2)
+        else:
+            ax.set_xticks(x)
+            ax.set_xticklabels(x, fontsize=fontsize)
+
+        if grid:
+            ax.grid(True, which='both', linestyle='--', linewidth=0.9, alpha=0.8)
+
+        # Hide the right and top spines & add legend
+        ax.spines['right'].set_visible(False)
+        ax.spines['top'].set_visible(False)
+        ax.legend()
+
+    def update(self, percentage, title=''):
+        """Set the heights of the bars (in percent), the labels and the title."""
+        for rect, height in zip(self.rects, percentage):
+            rect.set_height(height)
+        self.line.set_ydata(percentage)
+        for text, height in zip(self.labels, percentage):
+            text.xy = (text.xy[0], height)
+            text.set_text('' if np.isnan(height) else '{:0.1f}%'.format(height))
+        top = np.nanmax(np.r_[percentage, self.expected])
+        # Room for the labels above the bars
+        self.ax.set_ylim(0, top * 1.1)
+        self.ax.set_title(title, fontsize=self.fontsize)
+
+
+def _to_label(name):
+    """Return the name of a group as text, the keys of a group on multiple columns are joined."""
+    return ' '.join(map(str, name)) if isinstance(name, tuple) else str(name)
+
+
+def _to_filename(name):
+    """Return the name of a group as part of a file name."""
+    return re.sub(r'[^\w.-]+', '_', _to_label(name))
+
+
+def _to_filenames(names):
+    """Return unique file name parts, the index of the group is appended to the names that are the same after sanitizing."""
+    filenames = [_to_filename(name) for name in names]
+    n_names = {}
+    for filename in filenames:
+        n_names[filename] = n_names.get(filename, 0) + 1
+    unique = set(filenames)
+    for i, filename in enumerate(filenames):
+        if n_names[filename] > 1:
+            # Extend the name until it does not collide with another group, e.g. a group named 'a_b_1'
+            while filename in unique:
+                filename = f'{filename}_{i}'
+            unique.add(filename)
+            filenames[i] = filename
+    return filenames
+
+
+# %% Profiling
+class _Profiler:
+    """Accumulate the wall time and the peak allocated bytes of the stages of a fit."""
+
+    def __init__(self, memory=False):
+        self.memory = memory
+        self.timings = {}
+        self.allocated_bytes = {}
+        # Only stop the tracing afterwards if it is started here
+        self._tracing = memory and not tracemalloc.is_tracing()
+        if self._tracing: tracemalloc.start()
+
+    def __call__(self, name):
+        return _ProfilerStage(self, name)
+
+    def add(self, name, seconds, nbytes=None):
+        self.timings[name] = self.timings.get(name, 0.0) + seconds
+        if nbytes is not None:
+            self.allocated_bytes[name] = max(self.allocated_bytes.get(name, 0), nbytes)
+
+    def stop(self):
+        if self._tracing:
+            tracemalloc.stop()
+            self._tracing = False
+
+    def report(self, metrics):
+        """Send every stage to the metrics sink as metrics(stage, seconds, nbytes)."""
+        for name, seconds in self.timings.items():
+            metrics(name, seconds, self.allocated_bytes.get(name))
+
+
+class _ProfilerStage:
+    """Context manager that adds the wall time (and allocated bytes) of one stage to the profiler."""
+
+    def __init__(self, profiler, name):
+        self.profiler, self.name = profiler, name
+
+    def __enter__(self):
+        if self.profiler.memory:
+            tracemalloc.reset_peak()
+            self.start_bytes = tracemalloc.get_traced_memory()[0]
+        self.start = time.perf_counter()
+
+    def __exit__(self, *args):
+        seconds = time.perf_counter() - self.start
+        nbytes = tracemalloc.get_traced_memory()[1] - self.start_bytes if self.profiler.memory else None
+        self.profiler.add(self.name, seconds, nbytes)
+
+
+_NO_STAGE = nullcontext()
+
+
+def _stage(profiler, name):
+    """Return the context manager that profiles a stage, or a no-op if profiler is None."""
+    return _NO_STAGE if profiler is None else profiler(name)
+
+
+def _read_file_chunks(path, columns, chunksize, **kwargs):
+    """Yield DataFrames (CSV) or Arrow RecordBatches (Parquet) with the columns of a file, chunksize rows at a time."""
+    if str(path).lower().endswith(('.parquet', '.pq')):
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError('Reading Parquet files requires pyarrow: pip install pyarrow')
+        yield from pq.ParquetFile(path).iter_batches(batch_size=chunksize, columns=columns)
+    else:
+        import pandas as pd
+        with pd.read_csv(path, usecols=columns, chunksize=chunksize, **kwargs) as reader:
+            yield from reader
+
+
+def _get_digit_range(pos):
+    """Return the digit categories for the digit position."""
+    if pos == 'first_two':
+        return range(10, 100)
+    elif pos == 1:
+        return range(1, 10)
+    elif isinstance(pos, (int, np.integer)) and pos != 0 and abs(pos) < len(_POW10):
+        return range(0, 10)
+    raise ValueError(f'Invalid digit position: {pos}. Use a non-zero integer in [-{len(_POW10) - 1},..,{len(_POW10) - 1}] or "first_two".')
+
+
+def _count_position(X, pos, digit_range, profiler=None, normalize=False, return_rejected=False):
+    """Return the empirical digit counts of X for the digit position.
+
+    Large arrays (such as memory-mapped files) are processed in page-aligned windows
+    so that the temporary arrays never exceed the size of one window. The columns of
+    DataFrames and Tables and the chunks of Arrow and Polars data are converted one at
+    a time. Text is parsed with :func:`_parse_numbers`; with return_rejected=True the
+    number of values that could not be parsed (or are negative when they have no digits)
+    is returned as well.
+
+    """
+    with _stage(profiler, 'convert'):
+        chunks = _get_chunks(X)
+
+    counts_emp = np.zeros(len(digit_range), dtype=np.int64)
+    n_rejected = 0
+    drop_negative = _drop_negative(pos, normalize)
+    for X in chunks:
+        with _stage(profiler, 'convert'):
+            X, rejected = _to_numeric(X, drop_negative=drop_negative)
+        n_rejected += rejected
+        window = _get_window(X.itemsize)
+        for start in range(0, max(X.size, 1), window):
+            # Extract the digits based on position type
+            with _stage(profiler, 'extract'):
+                digits = _extract_digits(X[start:start + window], pos, normalize=normalize)
+            with _stage(profiler, 'count'):
+                counts_emp += _bincount_digits(digits, digit_range)[0]
+    if return_rejected:
+        return counts_emp, n_rejected
+    return counts_emp
+
+
+def _get_chunks(X):
+    """Return the 1-D parts of X that are converted one by one, without copying the data.
+
+    These are the columns of a pandas DataFrame (so that a frame with mixed dtypes is not copied),
+    the chunks of the columns of an Arrow Table or Polars DataFrame, and the chunks of an Arrow
+    ChunkedArray or Polars Series.
+
+    """
+    if _is_polars(X, 'Series'):
+        return [chunk.to_arrow() for chunk in X.get_chunks()]
+    if _is_polars(X, 'DataFrame'):
+        X = X.to_arrow()
+    if _is_arrow(X, 'Table') or _is_arrow(X, 'RecordBatch'):
+        return [chunk for column in X.columns for chunk in _get_chunks(column)]
+    if _is_arrow(X, 'ChunkedArray'):
+        return X.chunks
+    if _is_pandas(X, 'DataFrame'):
+        return [X.iloc[:, i] for i in range(X.shape[1])]
+    return [X]
+
+
+def _drop_negative(pos, normalize):
+    """Return whether negative values have no digits, which is the case without the significand scaling."""
+    return not normalize or (isinstance(pos, (int, np.integer)) and pos < 0)
+
+
+def _to_numeric(X, drop_negative=False, return_mask=False):
+    """Return the values of X as 1-D numeric numpy array and the number of text values that could not be parsed.
+
+    With drop_negative=True negative text values are rejected as well (see :func:`_parse_numbers`).
+    With return_mask=True the boolean mask of the rejected values is returned instead of their number,
+    or None for numeric input.
+
+    """
+    if _is_arrow(X, 'Array'):
+        return _arrow_to_numeric(X, drop_negative=drop_negative, return_mask=return_mask)
+    if not (_is_pandas(X, 'Series') or _is_pandas(X, 'Index') or isinstance(X, np.ndarray)):
+        X = np.asarray(X)
+    if _is_text(X):
+        return _parse_numbers(X, drop_negative=drop_negative, return_mask=return_mask)
+    return _to_numpy(X), None if return_mask else 0
+
+
+def _is_text(X):
+    """Return whether X contains text (a string dtype or objects that are not only numbers)."""
+    if X.dtype.kind in 'US':
+        return True
+    if X.dtype.kind == 'O' or (not isinstance(X.dtype, np.dtype) and getattr(X.dtype, 'numpy_dtype', np.dtype('O')).kind == 'O'):
+        from pandas.api.types import infer_dtype
+        return infer_dtype(X, skipna=True) not in ['integer', 'floating', 'mixed-integer-float', 'decimal', 'boolean', 'empty']
+    return False
+
+
+def _to_numpy(X):
+    """Return the values of X as 1-D numpy array, without a copy for numpy-backed pandas Series and Index."""
+    if _is_pandas(X, 'Series') or _is_pandas(X, 'Index'):
+        if isinstance(X.dtype, np.dtype):
+            return X.to_numpy()
+        numpy_dtype = getattr(X.dtype, 'numpy_dtype', None)
+        if numpy_dtype is not None and numpy_dtype.kind in 'iuf':
+            # Nullable and Arrow-backed numbers: missing values become 0, which has no digits
+            return X.to_numpy(dtype=numpy_dtype, na_value=0)
+    return np.asarray(X).reshape(-1)
+
+
+def _arrow_to_numeric(X, drop_negative=False, return_mask=False):
+    """Return the values of a pyarrow Array as numpy array, without a copy for numbers without missing values."""
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    if pa.types.is_dictionary(X.type):
+        X = X.dictionary_decode()
+    if pa.types.is_string(X.type) or pa.types.is_large_string(X.type) or pa.types.is_string_view(X.type):
+        return _parse_numbers(X, drop_negative=drop_negative, return_mask=return_mask)
+    if not (pa.types.is_integer(X.type) or pa.types.is_floating(X.type)):
+        # Decimals and booleans
+        X = pc.cast(X, pa.float64())
+    if X.null_count > 0:
+        # Missing values become 0, which has no digits
+        X = pc.fill_null(X, pa.scalar(0, type=X.type))
+    return X.to_numpy(zero_copy_only=False), None if return_mask else 0
+
+
+def _get_group_codes(df, by):
+    """Return the group index of every row (-1 for missing keys) and the sorted group keys, as with pandas groupby."""
+    import pandas as pd
+    if _is_pandas(df, 'DataFrame'):
+        grouper = df.groupby(by, sort=True, observed=True, dropna=True)
+        # Rows with a missing key have no group
+        return grouper.ngroup().fillna(-1).to_numpy(dtype=np.int64), grouper.size().index
+
+    # Arrow Table or RecordBatch: the keys are dictionary encoded and the codes are the ranks of the keys
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    by = [by] if isinstance(by, str) else list(by)
+    codes, keys = [], []
+    for name in by:
+        column = df.column(name)
+        if _is_arrow(column, 'ChunkedArray'):
+            column = column.combine_chunks()
+        encoded = pc.dictionary_encode(column)
+        order = pc.sort_indices(encoded.dictionary).to_numpy()
+        rank = np.empty(len(order), dtype=np.int64)
+        rank[order] = np.arange(len(order))
+        indices = pc.fill_null(encoded.indices, pa.scalar(-1, type=encoded.indices.type)).to_numpy()
+        codes.append(np.where(indices >= 0, rank[indices], -1))
+        keys.append(encoded.dictionary.take(pa.array(order)).to_pandas())
+    if len(by) == 1:
+        return codes[0], pd.Index(keys[0], name=by[0])
+
+    # Rows with a missing key are dropped, the observed combinations of the keys are sorted
+    Iloc = np.all(np.array(codes) >= 0, axis=0)
+    shape = [len(key) for key in keys]
+    unique, inverse = np.unique(np.ravel_multi_index([code[Iloc] for code in codes], shape), return_inverse=True)
+    group_codes = np.full(len(Iloc), -1, dtype=np.int64)
+    group_codes[Iloc] = inverse.reshape(-1)
+    index = pd.MultiIndex.from_arrays([key.to_numpy()[code] for key, code in zip(keys, np.unravel_index(unique, shape))], names=by)
+    return group_codes, index
+
+
+# %% Parsing of formatted numbers
+# Whitespace, including the non-breaking space that is used as thousands separator
+_SPACE = '[\\s\u00a0]*'
+# The number with optional thousands separators (comma, space or apostrophe) and an optional exponent
+_NUMBER = "(?:\\d{1,3}(?:[,\\s\u00a0'\u2019]\\d{3})+(?:\\.\\d*)?|\\d+(?:\\.\\d*)?|\\.\\d+)(?:[eE][-+]?\\d+)?"
+# Currency such as $, € or USD: 1 to 3 characters other than digits, separators, signs and parentheses
+_CURRENCY = f'(?:[^\\d\\s\u00a0.,()+-]{{1,3}}\\.?{_SPACE})?'
+# A formatted number: optional parentheses, signs (before or after) and currency
+_NUMBER_PATTERN = f'^{_SPACE}\\(?{_SPACE}[-+]?{_SPACE}{_CURRENCY}[-+]?{_SPACE}{_NUMBER}{_SPACE}{_CURRENCY}\\)?{_SPACE}-?{_SPACE}$'
+# The first number in the text, which is the number itself for text that matches _NUMBER_PATTERN
+_NUMBER_EXTRACT = "(?P<number>[\\d.][\\d.,\\t \u00a0'\u2019]*(?:[eE][-+]?\\d+)?)"
+_SEPARATORS = [',', ' ', '\t', '\u00a0', "'", '\u2019']
+# A minus sign before the number, after the number, or parentheses
+_NEGATIVE_PATTERN = '^[^\\d.]*-|-[\\s\u00a0]*$|\\('
+
+
+def _parse_numbers(X, drop_negative=False, return_mask=False):
+    """Parse text such as "1,234.56", "$ 99.00", "(1 200)" or "1e-05" into numbers.
+
+    The text is matched against regular expressions for the whole array at once, with the
+    compute functions of pyarrow if it is installed and with the string methods of pandas otherwise.
+    Text that does not match the format of a number is rejected. The thousands separators are removed
+    from the number; parentheses and a leading or trailing minus sign make the value negative.
+    The decimal separator is the point.
+
+    Parameters
+    ----------
+    X : array-like
+        Text values. Missing values and blank text are ignored.
+    drop_negative : bool, (default: False)
+        Reject the negative values, which have no digits without normalize.
+    return_mask : bool, (default: False)
+        Return the mask of the rejected values instead of their number.
+
+    Returns
+    -------
+    values : ndarray of float64
+        Parsed values (NaN for missing and rejected values).
+    n_rejected : int or ndarray of bool
+        Number of non-blank values that could not be parsed (or are negative with drop_negative=True),
+        or the mask of these values with return_mask=True.
+
+    """
+    import pandas as pd
+    try:
+        import pyarrow as pa
+        import pyarrow.compute as pc
+    except ImportError:
+        pa = None
+
+    if _is_arrow(X, 'Array'):
+        # The regular expressions are not implemented for string_view
+        text = X.cast(pa.large_string()) if pa.types.is_string_view(X.type) else X
+    else:
+        # Numbers in mixed object arrays are converted to their text
+        text = pd.Series(X, copy=False) if _is_pandas(X, 'Series') else pd.Series(np.asarray(X).reshape(-1), copy=False)
+        if not isinstance(text.dtype, pd.StringDtype):
+            text = text.astype('string[pyarrow]' if pa is not None else 'string')
+
+    if pa is not None:
+        text = pa.array(text)
+        valid = pc.fill_null(pc.match_substring_regex(text, _NUMBER_PATTERN), False)
+        number = pc.struct_field(pc.extract_regex(pc.if_else(valid, text, None), _NUMBER_EXTRACT), 'number')
+        # Remove the thousands separators that occur
+        for separator in _SEPARATORS:
+            if pc.any(pc.match_substring(number, separator)).as_py():
+                number = pc.replace_substring(number, separator, '')
+        values = pc.cast(number, pa.float64()).to_numpy(zero_copy_only=False)
+        negative = pc.fill_null(pc.match_substring_regex(text, _NEGATIVE_PATTERN), False).to_numpy(zero_copy_only=False)
+        blank = pc.fill_null(pc.equal(pc.utf8_trim_whitespace(text), ''), True).to_numpy(zero_copy_only=False)
+    else:
+        valid = text.str.match(_NUMBER_PATTERN).fillna(False).astype(bool)
+        number = text.where(valid).str.extract(_NUMBER_EXTRACT)['number'].str.replace('[^0-9.eE+-]', '', regex=True)
+        values = pd.to_numeric(number, errors='coerce').to_numpy(dtype=np.float64, na_value=np.nan)
+        negative = text.str.contains(_NEGATIVE_PATTERN, regex=True).fillna(False).to_numpy(dtype=bool)
+        blank = text.str.strip().eq('').fillna(True).to_numpy(dtype=bool)
+
+    values = np.where(negative, np.nan if drop_negative else -values, values)
+    rejected = np.isnan(values) & ~blank
+    if return_mask:
+        return values, rejected
+    return values, int(np.sum(rejected))
+
+
+def _extract_digits(data, pos, normalize=False):
+    """Return the digit at the position for each value (values without such digit get a digit outside the digit range)."""
+    if pos == 'first_two':
+        return _get_leading_digits(data, 2, normalize=normalize)
+    elif pos < 0:
+        return _get_trailing_digits(data, -pos)
+    return _get_digits(data, pos, normalize=normalize)
+
+
+def _is_pandas(X, name):
+    """Return whether X is an instance of pandas.<name> without importing pandas."""
+    pd = sys.modules.get('pandas')
+    return (pd is not None) and isinstance(X, getattr(pd, name))
+
+
+def _is_arrow(X, name):
+    """Return whether X is an instance of pyarrow.<name> without importing pyarrow."""
+    pa = sys.modules.get('pyarrow')
+    return (pa is not None) and isinstance(X, getattr(pa, name))
+
+
+def _is_polars(X, name):
+    """Return whether X is an instance of polars.<name> without importing polars."""
+    pl = sys.modules.get('polars')
+    return (pl is not None) and isinstance(X, getattr(pl, name))
+
+
+def _get_window(itemsize):
+    """Return the number of elements in a window of _WINDOW_BYTES that is aligned with the memory pages."""
+    window_bytes = max(mmap.PAGESIZE, (_WINDOW_BYTES // mmap.PAGESIZE) * mmap.PAGESIZE)
+    return max(1, window_bytes // itemsize)
+
+
+def _load_array(path, dtype=None):
+    """Memory-map a .npy file or a raw binary file without reading it into memory.
+
+    Parameters
+    ----------
+    path : str
+        Path to a .npy file or a raw binary file.
+    dtype : str or np.dtype, (default: None)
+        Data type of a raw binary file (e.g. 'int64' or 'float64'). Not used for .npy files.
+
+    Returns
+    -------
+    np.memmap or np.ndarray
+        Read-only memory-mapped array.
+
+    """
+    if str(path).lower().endswith('.npy'):
+        return np.load(path, mmap_mode='r')
+    if dtype is None:
+        raise ValueError(f'The dtype is required to read the raw binary file: {path}')
+    return np.memmap(path, dtype=dtype, mode='r')
+
+
+def _get_digit_codes(X, pos, digit_range, normalize=False, mark_rejected=False):
+    """Return for each value the index of its digit in the digit_range or len(digit_range) if the value has no such digit.
+
+    With mark_rejected=True the text values that could not be parsed (see :func:`_count_position`)
+    get the code len(digit_range) + 1.
+
+    """
+    K = len(digit_range)
+    drop_negative = _drop_negative(pos, normalize)
+    codes = []
+    for chunk in _get_chunks(X):
+        values, rejected = _to_numeric(chunk, drop_negative=drop_negative, return_mask=True)
+        chunk_codes = _extract_digits(values, pos, normalize=normalize) - digit_range[0]
+        chunk_codes[(chunk_codes < 0) | (chunk_codes >= K)] = K
+        if mark_rejected and rejected is not None:
+            chunk_codes[rejected] = K + 1
+        codes.append(chunk_codes)
+    return codes[0] if len(codes) == 1 else np.concatenate(codes)
+
+
+def _bincount_groups(X, group_codes, n_groups, pos, digit_range, normalize=False, return_rejected=False):
+    """Count the digits per group with a single 2-D histogram.
+
+    Parameters
+    ----------
+    X : array-like
+        Input data.
+    group_codes : array-like of int
+        Group index [0, n_groups) for each value. Negative codes are ignored.
+    n_groups : int
+        Number of groups.
+    pos : int or str
+        Digit position.
+    digit_range : range
+        The digit categories that are counted.
+    normalize : bool, (default: False)
+        Use the significant digits of the absolute values.
+    return_rejected : bool, (default: False)
+        Also return the number of rejected text values per group.
+
+    Returns
+    -------
+    counts_emp : ndarray of int64
+        Counts with shape (n_groups, len(digit_range)).
+    n_rejected : ndarray of int64
+        Number of rejected text values per group (only with return_rejected=True).
+
+    """
+    K = len(digit_range)
+    codes = _get_digit_codes(X, pos, digit_range, normalize=normalize, mark_rejected=return_rejected)
+    group_codes = np.asarray(group_codes, dtype=np.int64)
+    Iloc = group_codes >= 0
+    # Two extra bins per group collect the values without digit and the rejected values
+    counts_emp = np.bincount(group_codes[Iloc] * (K + 2) + codes[Iloc], minlength=n_groups * (K + 2)).reshape(n_groups, K + 2)
+    if return_rejected:
+        return counts_emp[:, :K], counts_emp[:, K + 1]
+    return counts_emp[:, :K]
+
+
+# %% Cache of the example datasets
+def _get_cache_path(data, url, sep, cache_dir=None):
+    """Return the path of the cached dataset without extension."""
+    if cache_dir is None:
+        cache_dir = os.environ.get('BENFORDSLAW_CACHE_DIR') or os.path.join(os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache'), 'benfordslaw')
+    if url is None:
+        name = re.sub(r'[^\w.-]+', '_', str(data))
+    else:
+        # Datasets from a url are stored under the hash of the url and the separator
+        name = 'url_' + hashlib.sha256(f'{url}|{sep}'.encode()).hexdigest()[:16]
+    return os.path.join(cache_dir, name)
+
+
+def _sha256(path):
+    """Return the SHA-256 checksum of a file."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _read_cache(path):
+    """Return the cached DataFrame, or None if it is not cached or the checksum does not match."""
+    try:
+        with open(path + '.json') as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return None
+    filename = os.path.join(os.path.dirname(path), meta.get('file', ''))
+    if not os.path.isfile(filename) or _sha256(filename) != meta.get('sha256'):
+        logger.warning(f"The cached dataset {filename} is missing or corrupted and is removed.")
+        for name in [filename, path + '.json']:
+            if os.path.isfile(name): os.remove(name)
+        return None
+
+    import pandas as pd
+    if meta['format'] == 'parquet':
+        return pd.read_parquet(filename)
+    if meta['format'] != 'npz':
+        return None
+    # Never unpickle the cache, text columns are stored as unicode arrays with a mask of the missing values
+    with np.load(filename, allow_pickle=False) as arrays:
+        columns = {}
+        for i, name in enumerate(meta['columns']):
+            values = arrays[f'c{i}']
+            if f'c{i}_null' in arrays:
+                values = values.astype(object)
+                values[arrays[f'c{i}_null']] = None
+            columns[name] = values
+    return pd.DataFrame(columns, columns=meta['columns'])
+
+
+def _write_cache(df, path, fmt=None):
+    """Store a DataFrame in the cache with its checksum, in Parquet if pyarrow is installed and as npz otherwise."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    if fmt is None:
+        fmt = 'parquet' if importlib.util.find_spec('pyarrow') else 'npz'
+    filename = f'{path}.{fmt}'
+    # Write to temporary files first so that an interrupted write does not leave a partial cache
+    tmp = f'{filename}.{os.getpid()}.tmp'
+    try:
+        meta = {'file': os.path.basename(filename), 'format': fmt}
+        if fmt == 'parquet':
+            df.to_parquet(tmp)
+        else:
+            arrays = {}
+            for i in range(df.shape[1]):
+                values = df.iloc[:, i].to_numpy()
+                if values.dtype == object:
+                    arrays[f'c{i}_null'] = df.iloc[:, i].isna().to_numpy()
+                    values = values.astype(str)
+                arrays[f'c{i}'] = values
+            # np.savez appends .npz to a filename, write to a file object instead
+            with open(tmp, 'wb') as f:
+                np.savez(f, **arrays)
+            meta['columns'] = [str(name) for name in df.columns]
+        meta.update({'sha256': _sha256(tmp), 'rows': int(len(df))})
+        os.replace(tmp, filename)
+        with open(tmp, 'w') as f:
+            json.dump(meta, f)
+        os.replace(tmp, path + '.json')
+    except Exception as e:
+        # The dataset is returned anyway, without cache
+        logger.warning(f"The dataset could not be stored in the cache {path}: {e}")
+        if os.path.isfile(tmp): os.remove(tmp)
+
+
+# %% Process-pool execution
+def _get_n_jobs(n_jobs):
+    """Return the number of worker processes (-1 or None uses all CPUs)."""
+    if (n_jobs is None) or (n_jobs < 0):
+        return os.cpu_count() or 1
+    return max(1, int(n_jobs))
+
+
+def _get_row_chunks(n_rows, n_jobs):
+    """Return the (start, stop) of n_jobs contiguous row chunks with about the same number of rows."""
+    bounds = np.linspace(0, n_rows, n_jobs + 1).astype(np.int64)
+    return list(zip(bounds[:-1], bounds[1:]))
+
+
+def _to_shared_memory(X):
+    """Copy an array into a new shared memory block.
+
+    Returns
+    -------
+    shm : SharedMemory
+        The block, which must be closed and unlinked by the caller.
+    spec : tuple (name, shape, dtype)
+        Description of the array to attach to the block in a worker with :func:`_from_shared_memory`.
+
+    """
+    from multiprocessing import shared_memory
+    X = np.ascontiguousarray(X)
+    shm = shared_memory.SharedMemory(create=True, size=max(X.nbytes, 1))
+    np.ndarray(X.shape, dtype=X.dtype, buffer=shm.buf)[...] = X
+    return shm, (shm.name, X.shape, X.dtype.str)
+
+
+def _from_shared_memory(spec):
+    """Attach to a shared memory block of :func:`_to_shared_memory`, returns the block and the array without a copy."""
+    from multiprocessing import shared_memory
+    name, shape, dtype = spec
+    # The workers share the resource tracker of the parent, which unlinks the block
+    shm = shared_memory.SharedMemory(name=name)
+    return shm, np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+
+
+def _count_groups_worker(values_spec, codes_spec, start, stop, n_groups, pos, normalize):
+    """Count the digits per (group x digit) of the rows [start, stop) in the shared memory."""
+    values_shm, values = _from_shared_memory(values_spec)
+    codes_shm, group_codes = _from_shared_memory(codes_spec)
+    try:
+        return _bincount_groups(values[start:stop], group_codes[start:stop], n_groups, pos, _get_digit_range(pos), normalize=normalize)
+    finally:
+        del values, group_codes
+        values_shm.close()
+        codes_shm.close()
+
+
+def _count_worker(values_spec, start, stop, pos, normalize):
+    """Count the digits of the rows [start, stop) in the shared memory."""
+    shm, values = _from_shared_memory(values_spec)
+    try:
+        return DigitCounts(pos=pos).update(values[start:stop], normalize=normalize).counts
+    finally:
+        del values
+        shm.close()
+
+
+# %% Vectorized statistics
+def _mad_statistics(counts_emp, expected_proportions, C, pos):
+    """Compute MAD, Expected MAD, and Excess MAD statistics for every row of a count matrix.
+
+    Mean Absolute Deviation (MAD) measures the average absolute difference between
+    observed and expected digit frequencies. Excess MAD adjusts for sample size,
+    providing a more reliable measure for detecting anomalies in Benford's Law analysis.
+
+    Parameters
+    ----------
+    counts_emp : array-like
+        Empirical counts with shape (n_groups, n_digits) or (n_digits,).
+    expected_proportions : array-like
+        Benford proportions for each digit category.
+    C : float
+        The constant C for the Expected MAD calculation.
+    pos : int or str
+        Digit position. The conformity thresholds of Nigrini (2012) are used for 'first_two'.
+
+    Returns
+    -------
+    mad : ndarray
+        Mean Absolute Deviation.
+    expected_mad : ndarray
+        Expected MAD for a pure Benford set of the same size (E(MAD) ≈ 1/√(C×N)).
+    excess_mad : ndarray
+        Excess MAD = MAD - E(MAD). Values below 0 indicate conformity.
+    conformity : ndarray of str
+        Conformity assessment based on Nigrini (2012) thresholds.
+
+    References
+    ----------
+    * Nigrini, M. (2012). Benford's Law: Applications for Forensic Accounting,
+      Auditing, and Fraud Detection. Hoboken, NJ: John Wiley & Sons.
+    * Barney, B. J., & Schulzke, K. S. (2016). Moderating "Cry Wolf" Events with
+      Excess MAD in Benford's Law Research and Practice.
+
+    """
+    counts_emp = np.atleast_2d(counts_emp)
+    total_count = counts_emp.sum(axis=1)
+    Iloc = total_count > 0
+    K = counts_emp.shape[1]
+    mad = np.full(len(total_count), np.nan)
+    expected_mad = np.full(len(total_count), np.nan)
+
+    # Calculate observed proportions
+    observed_proportions = counts_emp[Iloc] / total_count[Iloc, None]
+
+    # Calculate MAD: mean of absolute deviations
+    # MAD = (1/K) × Σ|Obs_k/N - Exp_k|
+    mad[Iloc] = np.sum(np.abs(observed_proportions - expected_proportions), axis=1) / K
+
+    # Calculate Expected MAD for a pure Benford set
+    # E(MAD) ≈ 1 / √(C × N) where C depends on the digit test
+    expected_mad[Iloc] = 1.0 / np.sqrt(C * total_count[Iloc])
+
+    # Calculate Excess MAD (the key contribution from Barney & Schulzke 2016)
+    excess_mad = mad - expected_mad
+
+    conformity = _get_conformity(mad, excess_mad, pos)
+    return mad, expected_mad, excess_mad, conformity
+
+
+def _get_conformity(mad, excess_mad, pos):
+    """Return the conformity assessment based on Nigrini (2012) thresholds ('insufficient data' for NaN)."""
+    if pos == 'first_two':
+        # Original thresholds from Nigrini (2012) for first-two-digits test
+        score, thresholds = mad, [0.0012, 0.0018, 0.0022]
+    else:
+        # For other digit tests, use Excess MAD-based interpretation
+        # Negative Excess MAD indicates better-than-expected conformity
+        score, thresholds = excess_mad, [0, 0.001, 0.002]
+    conformity = np.select([score < thresholds[0], score < thresholds[1], score < thresholds[2]],
+                           ['close conformity', 'acceptable conformity', 'marginally acceptable conformity'],
+                           default='nonconforming').astype(object)
+    conformity[np.isnan(mad)] = 'insufficient data'
+    return conformity
+
+
+def _compute_pvalues(counts_emp, counts_exp, method, excess_mad):
+    """Compute the test statistic and P-value for every row of a count matrix.
+
+    Parameters
+    ----------
+    counts_emp : array-like
+        Empirical counts with shape (n_groups, n_digits) or (n_digits,).
+    counts_exp : array-like
+        Expected counts with the shape (n_groups, n_digits).
+    method : str
+        'chi2', 'ks', 'kuiper', 'mad' or None (combined P-values of chi2 and ks based on Fisher's method).
+    excess_mad : array-like
+        Excess MAD for each row, used as test statistic for the 'mad' method.
+
+    Returns
+    -------
+    tstats : ndarray
+        Test statistic (NaN for rows without observations).
+    Praw : ndarray
+        P-value (NaN for the 'mad' method and for rows without observations).
+
+    """
+    from scipy.stats import chisquare, combine_pvalues
+    counts_emp = np.atleast_2d(counts_emp)
+    counts_exp = np.atleast_2d(counts_exp)
+    Iloc = counts_emp.sum(axis=1) > 0
+    tstats = np.full(len(counts_emp), np.nan)
+    Praw = np.full(len(counts_emp), np.nan)
+    if not np.any(Iloc):
+        return tstats, Praw
+
+    if method == 'mad':
+        # For MAD method, use excess_mad as the test statistic
+        # P-value is not applicable for MAD-based assessment
+        tstats[Iloc] = np.atleast_1d(excess_mad)[Iloc]
+        return tstats, Praw
+
+    if method in ['chi2', None, 'P_ensemble']:
+        try:
+            tstats_chi2, Praw_chi2 = chisquare(counts_emp[Iloc], f_exp=counts_exp[Iloc], axis=1)
+        except:
+            raise Exception('The relative tolerance of the chisquare test is not reached. Try using another method such as "method=ks". This is not a bug but a feature: "https://github.com/scipy/scipy/issues/13362" ')
+    if method in ['ks', None, 'P_ensemble']:
+        tstats_ks, Praw_ks = _ks_test(counts_emp[Iloc], counts_exp[Iloc])
+
+    if method == 'chi2':
+        tstats[Iloc], Praw[Iloc] = tstats_chi2, Praw_chi2
+    elif method == 'ks':
+        tstats[Iloc], Praw[Iloc] = tstats_ks, Praw_ks
+    elif method == 'kuiper':
+        tstats[Iloc], Praw[Iloc] = _kuiper_test(counts_emp[Iloc], counts_exp[Iloc])
+    elif method in [None, 'P_ensemble']:
+        tstats[Iloc], Praw[Iloc] = combine_pvalues(np.c_[Praw_chi2, Praw_ks], method='fisher', axis=1)
+    else:
+        raise ValueError(f"method {method} is not supported")
+    return tstats, Praw
+
+
+def _cumulative_differences(counts_emp, counts_exp):
+    """Return the differences F_emp - F_exp of the cumulative proportions and the number of observations."""
+    total_count = counts_emp.sum(axis=1)
+    diff = (np.cumsum(counts_emp, axis=1) - np.cumsum(counts_exp, axis=1)) / total_count[:, None]
+    return diff, total_count
+
+
+def _ks_test(counts_emp, counts_exp):
+    """Discrete one-sample Kolmogorov-Smirnov test on the cumulative digit proportions.
+
+    The statistic D = max|F_emp - F_exp| compares the cumulative distribution of the digits
+    with the cumulative Benford distribution. The P-value of the one-sample KS distribution
+    with N observations is used, which is conservative for discrete distributions.
+
+    Parameters
+    ----------
+    counts_emp : ndarray
+        Empirical counts with shape (n_groups, n_digits). Every row must contain observations.
+    counts_exp : ndarray
+        Expected counts with shape (n_groups, n_digits).
+
+    Returns
+    -------
+    tstats : ndarray
+        KS statistic D.
+    Praw : ndarray
+        P-value.
+
+    """
+    from scipy.stats import kstwo
+    diff, total_count = _cumulative_differences(counts_emp, counts_exp)
+    tstats = np.max(np.abs(diff), axis=1)
+    return tstats, kstwo.sf(tstats, total_count)
+
+
+def _kuiper_test(counts_emp, counts_exp):
+    """Discrete one-sample Kuiper test on the cumulative digit proportions.
+
+    The statistic V = max(F_emp - F_exp) + max(F_exp - F_emp) is, unlike the KS statistic,
+    equally sensitive to deviations at every digit. The asymptotic P-value of Stephens (1970) is used:
+    Q(λ) = 2 Σ (4j²λ² - 1) exp(-2j²λ²) with λ = (√N + 0.155 + 0.24/√N) V.
+
+    Parameters
+    ----------
+    counts_emp : ndarray
+        Empirical counts with shape (n_groups, n_digits). Every row must contain observations.
+    counts_exp : ndarray
+        Expected counts with shape (n_groups, n_digits).
+
+    Returns
+    -------
+    tstats : ndarray
+        Kuiper statistic V.
+    Praw : ndarray
+        P-value.
+
+    References
+    ----------
+    * Stephens, M. A. (1970). Use of the Kolmogorov-Smirnov, Cramer-Von Mises and related statistics
+      without extensive tables. Journal of the Royal Statistical Society: Series B, 32(1), 115-122.
+
+    """
+    diff, total_count = _cumulative_differences(counts_emp, counts_exp)
+    tstats = np.max(diff, axis=1).clip(0) + np.max(-diff, axis=1).clip(0)
+    sqrt_n = np.sqrt(total_count)
+    lam = (sqrt_n + 0.155 + 0.24 / sqrt_n) * tstats
+    j = np.arange(1, 101)[:, None]
+    Praw = 2 * np.sum((4 * j ** 2 * lam ** 2 - 1) * np.exp(-2 * j ** 2 * lam ** 2), axis=0)
+    # The series converges slowly for small λ where the P-value is 1
+    Praw = np.where(lam < 0.4, 1.0, np.clip(Praw, 0, 1))
+    return tstats, Praw
+
+
+# %% Monte-Carlo P-values
+# Number of simulations that are drawn at once (with their own seed)
+_SIMULATION_BLOCK = 1000
+
+
+def _digit_statistics(counts_emp, expected_proportions):
+    """Compute the chi-square, MAD, discrete KS and Kuiper statistics for every row of a count matrix.
+
+    Returns
+    -------
+    dict with ndarrays
+        chi2 : Σ (O - E)² / E
+        mad : Σ |O/N - p| / K
+        ks : max |F_emp - F_exp| of the cumulative proportions
+        kuiper : max(F_emp - F_exp) + max(F_exp - F_emp)
+
+    """
+    counts_emp = np.atleast_2d(counts_emp)
+    total_count = counts_emp.sum(axis=1)[:, None]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        counts_exp = total_count * expected_proportions
+        observed_proportions = counts_emp / total_count
+        diff = np.cumsum(observed_proportions, axis=1) - np.cumsum(expected_proportions)
+    return {'chi2': np.sum((counts_emp - counts_exp) ** 2 / counts_exp, axis=1),
+            'mad': np.mean(np.abs(observed_proportions - expected_proportions), axis=1),
+            'ks': np.max(np.abs(diff), axis=1),
+            'kuiper': np.max(diff, axis=1).clip(0) + np.max(-diff, axis=1).clip(0),
+            }
+
+
+@lru_cache(maxsize=256)
+def _get_null_distribution(pos, total_count, n_simulations, random_state, n_threads=1):
+    """Simulate the distribution of the statistics under the Benford distribution.
+
+    The multinomial samples are drawn in blocks, each with its own child seed, so that
+    the outcome does not depend on the number of threads. The result is cached per
+    (pos, N, n_simulations, random_state).
+
+    Returns
+    -------
+    dict with ndarrays
+        Sorted simulated chi2, mad, ks and kuiper statistics.
+
+    """
+    expected_proportions = _BENFORD_DISTRIBUTIONS[pos] / 100
+    sizes = [_SIMULATION_BLOCK] * (n_simulations // _SIMULATION_BLOCK)
+    if n_simulations % _SIMULATION_BLOCK: sizes.append(n_simulations % _SIMULATION_BLOCK)
+    seeds = np.random.SeedSequence(random_state).spawn(len(sizes))
+
+    def simulate(size, seed):
+        counts = np.random.default_rng(seed).multinomial(total_count, expected_proportions, size=size)
+        return _digit_statistics(counts, expected_proportions)
+
+    with ThreadPoolExecutor(max_workers=max(1, n_threads)) as executor:
+        out = list(executor.map(simulate, sizes, seeds))
+    return {key: np.sort(np.concatenate([stats[key] for stats in out])) for key in out[0]}
+
+
+def _simulate_pvalues(counts_emp, pos, method, excess_mad, n_simulations, random_state=None, n_threads=1):
+    """Compute the test statistics and Monte-Carlo P-values for every row of a count matrix.
+
+    The P-value is the fraction of simulated statistics that are at least as extreme as the
+    observed statistic: P = (1 + #(T_sim >= T)) / (1 + n_simulations).
+
+    Parameters
+    ----------
+    counts_emp : array-like
+        Empirical counts with shape (n_groups, n_digits) or (n_digits,).
+    pos : int or str
+        Digit position.
+    method : str
+        'chi2', 'ks', 'kuiper', 'mad' or None (combined P-values of chi2 and ks based on Fisher's method).
+    excess_mad : array-like
+        Excess MAD for each row, used as test statistic for the 'mad' method.
+    n_simulations : int
+        Number of simulations.
+    random_state : int, (default: None)
+        Seed for the simulations.
+    n_threads : int, (default: 1)
+        Number of threads that draw the simulations.
+
+    Returns
+    -------
+    tstats : ndarray
+        Test statistic (NaN for rows without observations).
+    Praw : ndarray
+        Monte-Carlo P-value (NaN for rows without observations).
+
+    """
+    from scipy.stats import chi2
+    counts_emp = np.atleast_2d(counts_emp)
+    total_count = counts_emp.sum(axis=1)
+    stats = _digit_statistics(counts_emp, _BENFORD_DISTRIBUTIONS[pos] / 100)
+    pvalues = {key: np.full(len(counts_emp), np.nan) for key in stats}
+
+    for N in np.unique(total_count[total_count > 0]):
+        Iloc = total_count == N
+        null = _get_null_distribution(pos, int(N), n_simulations, random_state, n_threads)
+        for key in pvalues:
+            # Relative tolerance to count the simulations with the same statistic (but rounded differently) as ties
+            n_extreme = n_simulations - np.searchsorted(null[key], stats[key][Iloc] * (1 - 1e-10), side='left')
+            pvalues[key][Iloc] = (1 + n_extreme) / (1 + n_simulations)
+
+    if method == 'chi2':
+        return np.where(total_count > 0, stats['chi2'], np.nan), pvalues['chi2']
+    elif method in ['ks', 'kuiper']:
+        return np.where(total_count > 0, stats[method], np.nan), pvalues[method]
+    elif method == 'mad':
+        return np.where(total_count > 0, excess_mad, np.nan), pvalues['mad']
+    # Combine the P-values with Fisher's method
+    tstats = -2 * (np.log(pvalues['chi2']) + np.log(pvalues['ks']))
+    return tstats, chi2.sf(tstats, 4)
+
+
+# %% Counts and the frequencies in percentage for the first digit
+def _count_first_digit(data):
+    # Values below 1 have no first digit and are ignored
+    data = np.asarray(data)
+
+    # Get the first digits and count occurences for [1-9]
+    return _bincount_digits(_get_digits(data, 1), range(1, 10))
 
 
 # %% Counts and the frequencies in percentage for the first two digits
@@ -533,7 +2251,7 @@ def _count_first_two_digits(data):
     -------
     empirical_counts : ndarray
         Counts for each first-two-digit pair (10-99).
-    empirical_percentage : list
+    empirical_percentage : ndarray
         Percentage for each first-two-digit pair.
     total_count : int
         Total number of valid observations.
@@ -542,77 +2260,301 @@ def _count_first_two_digits(data):
 
     """
     # Convert to numpy array if needed
-    data = np.asarray(data).flatten()
+    data = np.asarray(data).ravel()
 
-    # Get only values with at least 2 digits (>= 10)
-    data = data[data >= 10]
+    # Get the first two digits (values below 10 have no first two digits and are ignored) and count occurences for each pair from 10 to 99
+    return _bincount_digits(_get_leading_digits(data, 2), range(10, 100))
 
-    # Get the first two digits
-    first_two_digits = []
-    for x in data:
-        s = str(int(abs(x)))
-        if len(s) >= 2:
-            first_two_digits.append(int(s[:2]))
 
-    # Count occurences for each pair from 10 to 99
-    empirical_counts = np.zeros(90)
-    digit = []
-    for i in range(10, 100):
-        empirical_counts[i - 10] = first_two_digits.count(i)
-        digit.append(i)
+# %% Counts and the frequencies in percentage for the second digit
+def _count_digit(data, d, digit_range):
+    # Values below 1 have no digits and are ignored
+    data = np.asarray(data)
 
-    # Total amount
-    total_count = sum(empirical_counts)
-    empirical_percentage = [np.nan] * len(empirical_counts)
+    # Get the ith digit, counted from the right if last digits are required
+    digits = _extract_digits(data, d)
 
-    # Make percentage
-    if total_count > 0:
-        empirical_percentage = [(i / total_count) * 100 for i in empirical_counts]
+    # Count occurences. Make sure every position is for the digit_range
+    return _bincount_digits(digits, digit_range)
 
-    # Return
-    return empirical_counts, empirical_percentage, total_count, digit
 
+# %% Histogram of digits
+def _bincount_digits(digits, digit_range):
+    """Count the occurences of each digit in a single pass over the data.
 
-# %% Counts and the frequencies in percentage for the second digit
-def _count_digit(data, d, digit_range):
-    # Get only non-zero values
-    data = data[data >= 1]
-
-    # Reverse numbers if last digits is required
-    if d < 0:
-        data = list(map(lambda x: x[::-1], data.astype(str)))
-        data = np.array(data).astype(int)
-        d = d * -1
-
-    # Remove one because pythons starts counting from 0
-    d = d - 1
-
-    # Get the ith digit
-    digits = np.zeros_like(data)
-    Iloc = data >= np.power(10, d)
-    Iloc[np.isnan(Iloc)] = False
-    Iloc = Iloc.astype(bool)
-    digits[Iloc] = list(map(lambda x: int(str(x)[d]), data[Iloc]))
-
-    # Count occurences. Make sure every position is for [1-9]
-    empirical_counts = np.zeros(len(digit_range))
-    digitnr = []
-    for i in digit_range:
-        empirical_counts[i - digit_range[0]] = list(digits[Iloc]).count(i)
-        digitnr.append(i)
+    Parameters
+    ----------
+    digits : ndarray of int
+        Extracted digits. Values outside the digit_range (such as -1) are ignored.
+    digit_range : range
+        The digit categories that are counted.
+
+    Returns
+    -------
+    empirical_counts : ndarray of int64
+        Counts for each digit in the digit_range.
+    empirical_percentage : ndarray
+        Percentage for each digit in the digit_range (NaN if there are no observations).
+    total_count : int
+        Total number of valid observations.
+    digit : list
+        List of digits in the digit_range.
+
+    """
+    K = len(digit_range)
+    codes = np.asarray(digits, dtype=np.int64) - digit_range[0]
+    codes = codes[(codes >= 0) & (codes < K)]
+    empirical_counts = np.bincount(codes, minlength=K)
 
     # Total amount
-    total_count = sum(empirical_counts)
-    empirical_percentage = [np.nan] * len(empirical_counts)
+    total_count = int(empirical_counts.sum())
     # Make percentage
-    if total_count > 0:
-        empirical_percentage = [(i / total_count) * 100 for i in empirical_counts]
+    empirical_percentage = _counts_to_percentage(empirical_counts, total_count)
     # Return
-    return empirical_counts, empirical_percentage, total_count, digitnr
+    return empirical_counts, empirical_percentage, total_count, list(digit_range)
+
+
+def _counts_to_percentage(empirical_counts, total_count):
+    """Return the percentage for each digit count (NaN if there are no observations)."""
+    if total_count > 0:
+        return (empirical_counts / total_count) * 100
+    return np.full(len(empirical_counts), np.nan)
+
+
+# %% Vectorized digit extraction
+# Size of the windows in which large arrays are processed
+_WINDOW_BYTES = 1 << 23
+# Powers of ten that fit in int64: 10^0 .. 10^18
+_POW10 = 10 ** np.arange(19, dtype=np.int64)
+# Powers of ten as floats, 10^-200 .. 10^200, to scale the floats in two steps
+_POW10_FLOAT_OFFSET = 200
+_POW10_FLOAT = 10.0 ** np.arange(-_POW10_FLOAT_OFFSET, _POW10_FLOAT_OFFSET + 1)
+# Number of significant decimal digits that float64 represents exactly
+_MAX_SIGNIFICANT_DIGITS = 15
+
+
+def _to_integer(data):
+    """Return the integer part of the values as int64 array.
+
+    Integers are passed as is. Floats are truncated towards zero; non-finite values and
+    values outside the int64 range are set to 0 so that they do not contribute any digit.
+
+    """
+    data = np.asarray(data)
+    if np.issubdtype(data.dtype, np.integer):
+        return data.astype(np.int64, copy=False)
+
+    data = np.asarray(data, dtype=np.float64)
+    Iloc = np.isfinite(data) & (np.abs(data) < 2**63)
+    out = np.zeros(data.shape, dtype=np.int64)
+    out[Iloc] = np.trunc(data[Iloc]).astype(np.int64)
+    return out
+
+
+def _get_digits(data, d, normalize=False):
+    """Extract the d-th digit (counted from the left) of each value.
+
+    The digit is computed with integer arithmetic on the whole array at once:
+    the number of digits is looked up in a table with powers of ten, after which
+    the d-th digit is obtained by floor-division and modulo. For integer input the
+    outcome is identical to ``int(str(x)[d - 1])``.
+
+    Parameters
+    ----------
+    data : array-like
+        Input data containing positive numbers.
+    d : int
+        Digit position (1: first digit, 2: second digit, etc).
+    normalize : bool, (default: False)
+        Use the significant digits of the absolute values (see :func:`_get_significant_digits`).
+
+    Returns
+    -------
+    digits : ndarray of int64
+        The d-th digit of each value or -1 if the value has less than d digits.
+
+    """
+    digits = _get_leading_digits(data, d, normalize=normalize)
+    Iloc = digits >= 0
+    digits[Iloc] %= 10
+    return digits
+
+
+def _get_leading_digits(data, n, normalize=False):
+    """Extract the number formed by the first n digits of each value.
+
+    Parameters
+    ----------
+    data : array-like
+        Input data containing positive numbers.
+    n : int
+        Number of leading digits (2: first two digits, etc).
+    normalize : bool, (default: False)
+        Use the significant digits of the absolute values (see :func:`_get_significant_digits`).
+
+    Returns
+    -------
+    digits : ndarray of int64
+        The first n digits of each value (e.g. 12 for 1234 and n=2) or -1 if the value has less than n digits.
+
+    """
+    if normalize:
+        return _get_significant_digits(data, n)
+    data = _to_integer(data)
+    # Number of digits of the integer part (0 for values below 1)
+    ndigits = np.searchsorted(_POW10, data, side='right')
+    shift = ndigits - n
+    Iloc = shift >= 0
+    digits = np.full(data.shape, -1, dtype=np.int64)
+    digits[Iloc] = data[Iloc] // _POW10[shift[Iloc]]
+    return digits
+
+
+def _get_significant_digits(data, n):
+    """Extract the number formed by the first n significant digits of the absolute values.
+
+    Floats are normalized to their significand m = |x| / 10^floor(log10|x|) in [1, 10), so 0.00437,
+    4.37e-05 and -4370 all give 43 for n=2. The scaled significand is rounded to 15 significant digits,
+    the decimal precision of float64, before the digits are taken, so that 0.3 (stored as 0.29999...)
+    gives 3. Digits beyond the 15th are not represented by float64 and raise a ValueError. Integers are scaled the
+    same way with integer arithmetic on their absolute value, so 7 and 7.0 both give 70 for n=2.
+
+    Parameters
+    ----------
+    data : array-like
+        Input data.
+    n : int
+        Number of significant digits (1: first digit, 2: first two digits, etc), at most 15.
+
+    Returns
+    -------
+    digits : ndarray of int64
+        The first n significant digits of each value or -1 for zero and non-finite values.
+
+    """
+    if n > _MAX_SIGNIFICANT_DIGITS:
+        raise ValueError(f"The significant digits are available up to position {_MAX_SIGNIFICANT_DIGITS}, the precision of float64.")
+    data = np.asarray(data)
+    if np.issubdtype(data.dtype, np.integer):
+        # The absolute value of the int64 minimum does not fit, it has no digits here
+        data = data.astype(np.int64, copy=False)
+        data = np.abs(np.where(data == np.iinfo(np.int64).min, 0, data))
+        # Shift the integers right, or left when they have less than n digits
+        shift = np.searchsorted(_POW10, data, side='right') - n
+        Iloc = shift >= 0
+        digits = np.empty(data.shape, dtype=np.int64)
+        digits[Iloc] = data[Iloc] // _POW10[shift[Iloc]]
+        digits[~Iloc] = data[~Iloc] * _POW10[-shift[~Iloc]]
+        digits[data == 0] = -1
+        return digits
+
+    data = np.abs(np.asarray(data, dtype=np.float64))
+    Iloc = np.isfinite(data) & (data > 0)
+    values = data[Iloc] if not Iloc.all() else data
+    # Scale into [10^(n-1), 10^n) in two steps so that 10^scale does not overflow for subnormal values
+    scale = (n - 1 - np.floor(np.log10(values))).astype(np.int64)
+    half = scale // 2
+    values = values * _POW10_FLOAT[half + _POW10_FLOAT_OFFSET] * _POW10_FLOAT[scale - half + _POW10_FLOAT_OFFSET]
+    # Guard against the rounding of log10, the representation of the value, and the scaling
+    values = np.round(values, _MAX_SIGNIFICANT_DIGITS - n)
+    values[values >= 10.0 ** n] /= 10
+    values[values < 10.0 ** (n - 1)] *= 10
+
+    digits = np.full(data.shape, -1, dtype=np.int64)
+    digits[Iloc] = np.floor(values).astype(np.int64)
+    return digits
+
+
+def _get_trailing_digits(data, d):
+    """Extract the d-th digit (counted from the right) of each value.
+
+    The digit is computed with modulo and floor-division on integer dtypes, so
+    trailing zeros are kept: the last digit of 1230 is 0 and the second last is 3.
+
+    Parameters
+    ----------
+    data : array-like
+        Input data containing positive numbers.
+    d : int
+        Digit position (1: last digit, 2: second last digit, etc).
+
+    Returns
+    -------
+    digits : ndarray of int64
+        The d-th last digit of each value or -1 if the value has less than d digits.
+
+    """
+    data = _to_integer(data)
+    digits = (data // _POW10[d - 1]) % 10
+    digits[data < _POW10[d - 1]] = -1
+    return digits
+
+
+# %% Benford distributions
+def _get_benford_distribution(pos):
+    """Compute the exact Benford probabilities for the digit position.
+
+    * 'first_two': P(k) = log10(1 + 1/k) for k=10..99
+    * n-th digit: P(d) = Σ log10(1 + 1/(10k + d)) for k=10^(n-2)..10^(n-1)-1
+    * last digits: uniform distribution
+
+    The sum over k is evaluated term by term for the first digits and with the
+    Euler-Maclaurin formula for positions >= 5, where it is exact up to rounding.
+
+    Returns
+    -------
+    ndarray
+        Probabilities for each digit in the digit_range.
+
+    """
+    # math.log(x, 10) instead of np.log10 keeps the probabilities (and the P-values) identical to earlier versions
+    if pos == 'first_two':
+        return np.array([math.log(1 + (1 / k), 10) for k in range(10, 100)])
+    elif pos < 0:
+        return np.full(10, 0.1)
+    elif pos == 1:
+        return np.array([math.log(1 + (1 / k), 10) for k in range(1, 10)])
+
+    d = np.arange(10)
+    a, b = 10 ** (pos - 2), 10 ** (pos - 1) - 1
+    if pos < 5:
+        k = np.arange(a, b + 1)[:, None]
+        return np.sum(np.log1p(1 / (10 * k + d)), axis=0) / np.log(10)
+
+    # Euler-Maclaurin: Σf(k) = ∫f + (f(a) + f(b)) / 2 + (f'(b) - f'(a)) / 12 for f(k) = log10(1 + 1/(10k + d))
+    def integral(u):
+        # Antiderivative of ln(u + 1) - ln(u), written to avoid cancellation for large u
+        return np.log(u + 1) + u * np.log1p(1 / u) - 1
+
+    def f(x):
+        return np.log1p(1 / (10.0 * x + d)) / np.log(10)
+
+    def df(x):
+        return 10 / np.log(10) * (1 / (10.0 * x + d + 1) - 1 / (10.0 * x + d))
+
+    return (integral(10.0 * b + d) - integral(10.0 * a + d)) / (10 * np.log(10)) + (f(a) + f(b)) / 2 + (df(b) - df(a)) / 12
+
+
+def _excess_mad_constant(p):
+    """Compute the constant C for the Expected MAD: C = K² × π / (2 × (Σ √(p_k × (1 - p_k)))²)."""
+    return len(p) ** 2 * math.pi / (2 * np.sum(np.sqrt(p * (1 - p))) ** 2)
+
+
+# Benford's Law percentage-distributions for every digit position, computed once at import
+_BENFORD_DISTRIBUTIONS = {}
+_EXCESS_MAD_CONSTANTS = {}
+for _pos in ['first_two'] + [pos for n in range(1, len(_POW10)) for pos in [n, -n]]:
+    _p = _get_benford_distribution(_pos)
+    _BENFORD_DISTRIBUTIONS[_pos] = _p * 100
+    _BENFORD_DISTRIBUTIONS[_pos].setflags(write=False)
+    _EXCESS_MAD_CONSTANTS[_pos] = _excess_mad_constant(_p)
+# The published constant for the first-two-digits test (Barney & Schulzke, 2016)
+_EXCESS_MAD_CONSTANTS['first_two'] = 158.8
+del _pos, _p
 
 
 # %% Standalone function for computing Excess MAD
-def compute_excess_mad(data, pos='first_two'):
+def compute_excess_mad(data, pos='first_two', n_jobs=1, normalize=False):
     """Compute Excess MAD for a dataset without creating a benfordslaw object.
 
     This is a convenience function that computes the Excess MAD statistic
@@ -624,6 +2566,10 @@ def compute_excess_mad(data, pos='first_two'):
         Input data containing numbers.
     pos : str or int, (default: 'first_two')
         Digit position to analyze. See benfordslaw class for options.
+    n_jobs : int, (default: 1)
+        Number of worker processes that count the digits of equal chunks of the data. -1 uses all CPUs.
+    normalize : bool, (default: False)
+        Use the significant digits of the absolute values. See benfordslaw class.
 
     Returns
     -------
@@ -652,8 +2598,21 @@ def compute_excess_mad(data, pos='first_two'):
       in Benford's Law Research and Practice. Journal of Forensic Accounting Research, 1(1), A66-A90.
 
     """
-    bl = benfordslaw(pos=pos, method='mad', verbose='info')
-    results = bl.fit(np.asarray(data))
+    bl = benfordslaw(pos=pos, method='mad', verbose='info', normalize=normalize)
+    n_jobs = _get_n_jobs(n_jobs)
+    if n_jobs == 1:
+        results = bl.fit(_as_column(data))
+    else:
+        values = np.concatenate([_to_numeric(chunk)[0] for chunk in _get_chunks(_as_column(data))])
+        shm, values_spec = _to_shared_memory(values)
+        try:
+            worker = partial(_count_worker, values_spec, pos=pos, normalize=normalize)
+            with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+                counts = list(executor.map(worker, *zip(*_get_row_chunks(len(values), n_jobs))))
+        finally:
+            shm.close()
+            shm.unlink()
+        results = bl.fit_counts(DigitCounts(pos=pos, counts=np.sum(counts, axis=0)))
     return {
         'mad': results['mad'],
         'expected_mad': results['expected_mad'],
@@ -663,6 +2622,126 @@ def compute_excess_mad(data, pos='first_two'):
     }
 
 
+def compute_excess_mad_batch(data, pos='first_two', n_jobs=1, normalize=False):
+    """Compute Excess MAD for many columns at once.
+
+    The digits of each column are counted into a (columns x digits) count matrix,
+    after which MAD, Expected MAD, Excess MAD and conformity are computed for all
+    columns in one vectorized pass. No benfordslaw object is created per column.
+
+    Parameters
+    ----------
+    data : 2-D array, list of arrays, dict of arrays, pd.DataFrame, pyarrow Table or polars DataFrame
+        Input data. The columns of a 2-D array or DataFrame, the elements of a list,
+        or the values of a dict are analyzed separately. A 1-D array or Series is one column. Arrow and Polars columns are
+        read chunk by chunk without conversion.
+    pos : str or int, (default: 'first_two')
+        Digit position to analyze. See benfordslaw class for options.
+    n_jobs : int, (default: 1)
+        Number of worker processes over which the columns are divided. -1 uses all CPUs.
+    normalize : bool, (default: False)
+        Use the significant digits of the absolute values. See benfordslaw class.
+
+    Returns
+    -------
+    pd.DataFrame
+        One row per column with mad, expected_mad, excess_mad, conformity_mad and N.
+
+    Examples
+    --------
+    >>> from benfordslaw import compute_excess_mad_batch
+    >>> import numpy as np
+    >>> X = np.random.lognormal(mean=5, sigma=2, size=(10000, 50))
+    >>> results = compute_excess_mad_batch(X, pos='first_two')
+    >>> print(results.sort_values('excess_mad'))
+
+    References
+    ----------
+    * Barney, B. J., & Schulzke, K. S. (2016). Moderating "Cry Wolf" Events with Excess MAD
+      in Benford's Law Research and Practice. Journal of Forensic Accounting Research, 1(1), A66-A90.
+
+    """
+    import pandas as pd
+    names, columns = _get_columns(data)
+    digit_range = _get_digit_range(pos)
+
+    # Count the digits per column
+    n_jobs = min(_get_n_jobs(n_jobs), max(len(columns), 1))
+    if n_jobs == 1:
+        counts_emp = _count_columns(columns, pos, normalize=normalize)
+    else:
+        blocks = [columns[i::n_jobs] for i in range(n_jobs)]
+        with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+            out = list(executor.map(partial(_count_columns, pos=pos, normalize=normalize), blocks))
+        # Restore the order of the columns
+        counts_emp = np.zeros((len(columns), len(digit_range)), dtype=np.int64)
+        for i, counts in enumerate(out):
+            counts_emp[i::n_jobs] = counts
+
+    # Compute the statistics for all columns
+    mad, expected_mad, excess_mad, conformity = _mad_statistics(counts_emp, _BENFORD_DISTRIBUTIONS[pos] / 100, _EXCESS_MAD_CONSTANTS[pos], pos)
+    return pd.DataFrame({'mad': mad,
+                         'expected_mad': expected_mad,
+                         'excess_mad': excess_mad,
+                         'conformity_mad': conformity,
+                         'N': counts_emp.sum(axis=1),
+                         }, index=names)
+
+
+def _get_columns(data):
+    """Return the names and the 1-D arrays of the columns in data (the Arrow columns are not converted)."""
+    if _is_polars(data, 'DataFrame'):
+        data = data.to_arrow()
+    if _is_arrow(data, 'Table') or _is_arrow(data, 'RecordBatch'):
+        return list(data.column_names), list(data.columns)
+    if _is_pandas(data, 'DataFrame'):
+        # Select by position, the column names are not necessarily unique
+        return list(data.columns), [_to_numpy(data.iloc[:, i]) for i in range(data.shape[1])]
+    if isinstance(data, dict):
+        return list(data.keys()), [_as_column(values) for values in data.values()]
+    if _is_pandas(data, 'Series'):
+        return [0 if data.name is None else data.name], [_to_numpy(data)]
+    if isinstance(data, np.ndarray):
+        if data.ndim > 2:
+            raise ValueError(f'Expected a 1-D or 2-D array but got {data.ndim} dimensions.')
+        if data.ndim < 2:
+            return [0], [data.ravel()]
+        return list(range(data.shape[1])), list(data.T)
+    return list(range(len(data))), [_as_column(values) for values in data]
+
+
+def _as_column(X):
+    """Return X as 1-D numpy array, Arrow and Polars data is returned as is and converted chunk by chunk."""
+    if _is_arrow(X, 'Array') or _is_arrow(X, 'ChunkedArray') or _is_polars(X, 'Series'):
+        return X
+    return _to_numpy(X)
+
+
+def _get_column(df, name):
+    """Return a column of a pandas DataFrame, Arrow Table or RecordBatch, Polars DataFrame or dict."""
+    if _is_arrow(df, 'Table') or _is_arrow(df, 'RecordBatch'):
+        return df.column(name)
+    return df[name]
+
+
+def _log_rejected(n_rejected):
+    """Warn about the rejected text values of the groups or columns and return their numbers."""
+    if np.sum(n_rejected) > 0:
+        logger.warning(f"{np.sum(n_rejected)} values could not be parsed as number (or are negative) and are ignored.")
+    return n_rejected
+
+
+def _count_columns(columns, pos, normalize=False, return_rejected=False):
+    """Return the (columns x digits) count matrix (and the number of rejected text values per column)."""
+    digit_range = _get_digit_range(pos)
+    counts_emp = np.zeros((len(columns), len(digit_range)), dtype=np.int64)
+    n_rejected = np.zeros(len(columns), dtype=np.int64)
+    for i, X in enumerate(columns):
+        counts_emp[i], n_rejected[i] = _count_position(X, pos, digit_range, normalize=normalize, return_rejected=True)
+    if return_rejected:
+        return counts_emp, n_rejected
+    return counts_emp
+
 
 # %%
 def set_logger(verbose: [str, int] = 'info', return_status: bool = False):
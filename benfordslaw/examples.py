@@ -1,3 +1,97 @@
+# %% Save the charts of many groups without showing them
+import os
+import tempfile
+import numpy as np
+import pandas as pd
+from benfordslaw import benfordslaw
+from benfordslaw.simulate import generate
+
+df = pd.DataFrame({'amount': generate(1000000, dtype='int64', random_state=1),
+                   'vendor': np.random.randint(0, 1000, size=1000000)})
+bl = benfordslaw(pos=1, method='chi2')
+results = bl.fit_groups(df, value_col='amount', by='vendor')
+
+# One page per vendor in a single PDF file, or one PNG file per vendor
+outdir = tempfile.mkdtemp()
+bl.plot_batch(os.path.join(outdir, 'vendors.pdf'))
+paths = bl.plot_batch(os.path.join(outdir, 'vendors_{}.png'))
+
+# A single chart that is only saved
+results = bl.fit(df['amount'])
+fig, ax = bl.plot(show=False, savepath=os.path.join(outdir, 'amounts.svg'))
+
+# %% The 100 vendors with the largest Excess MAD in one figure
+results = bl.fit_groups(df, value_col='amount', by='vendor')
+fig, axes = bl.plot_grid(results.nlargest(100, 'excess_mad'), ncols=10)
+
+# %% Test every column of a DataFrame
+import numpy as np
+import pandas as pd
+from benfordslaw import benfordslaw
+
+df = pd.DataFrame({'revenue': np.random.lognormal(mean=8, sigma=2, size=10000),
+                   'costs': np.random.randint(1000, 10000, size=10000)})
+
+# One row per column, the columns are not copied
+bl = benfordslaw(pos='first_two', method='mad')
+results = bl.fit_columns(df)
+print(results)
+
+# %% Synthetic data with manipulations
+from benfordslaw import benfordslaw
+from benfordslaw.simulate import generate, generate_chunks
+
+# 5% of the values have a 9 as first digit
+X = generate(1000000, substitution=0.05, digit=9, random_state=1)
+results = benfordslaw(method='chi2').fit(X)
+
+# Amounts that are pushed just under an approval limit of 5000, generated in chunks
+bl = benfordslaw(pos='first_two', method='mad')
+for X in generate_chunks(10000000, chunksize=1000000, dtype='int64', thresholding=0.2, limit=5000, random_state=1):
+    bl.partial_fit(X)
+results = bl.finalize()
+bl.plot(title='Thresholding under 5000')
+
+# %% Test every group in one pass
+from benfordslaw import benfordslaw
+
+bl = benfordslaw(pos=1, method='chi2')
+df = bl.import_example(data='elections_usa')
+
+# One row per candidate
+results = bl.fit_groups(df, value_col='votes', by='candidate')
+print(results.sort_values('excess_mad'))
+
+# %% Count shards in worker processes and merge the digit counts
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from benfordslaw import benfordslaw, DigitCounts
+
+def count_shard(seed):
+    X = np.random.default_rng(seed).lognormal(mean=5, sigma=2, size=100000)
+    # Only the compact counts are send back to the parent process
+    return DigitCounts(pos='first_two').update(X).to_bytes()
+
+with ProcessPoolExecutor() as executor:
+    shards = [DigitCounts.from_bytes(data) for data in executor.map(count_shard, range(8))]
+
+bl = benfordslaw(pos='first_two', method='mad')
+results = bl.fit_counts(sum(shards))
+
+# %% Incremental fit on chunks of data
+import numpy as np
+from benfordslaw import benfordslaw
+
+bl = benfordslaw(method='chi2')
+
+# Feed the data in chunks, e.g. from a generator, without building the full array
+for _ in range(10):
+    bl.partial_fit(np.random.lognormal(mean=5, sigma=2, size=100000))
+
+# Compute the statistics on the running totals
+results = bl.finalize()
+bl.plot(title='Incremental fit')
+
 # %% Excess MAD - sample size adjusted conformity measure
 # Reference: Barney & Schulzke (2016), Journal of Forensic Accounting Research
 from benfordslaw import benfordslaw, compute_excess_mad
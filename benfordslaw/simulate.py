@@ -0,0 +1,309 @@
+"""Generate synthetic data that follows Benford's law, optionally with manipulations.
+
+ Name        : simulate.py
+ Author      : E.Taskesen
+ Contact     : erdogant@gmail.com
+ github      : github.com/erdogant/benfordslaw.py
+ Licence     : MIT
+
+The values are drawn in blocks of fixed size, each with its own child seed. The outcome therefore
+only depends on random_state: not on the number of threads, nor on the chunksize of generate_chunks().
+
+Example
+-------
+>>> from benfordslaw import benfordslaw
+>>> from benfordslaw.simulate import generate, generate_chunks
+>>> #
+>>> # 1 million values of which 5% have the first digit replaced by a 9
+>>> X = generate(1000000, substitution=0.05, digit=9, random_state=1)
+>>> results = benfordslaw(method='chi2').fit(X)
+>>> #
+>>> # 100 million integers in chunks, rounded and pushed under an approval limit of 5000
+>>> bl = benfordslaw(pos='first_two')
+>>> for X in generate_chunks(100000000, dtype='int64', rounding=0.02, thresholding=0.3, limit=5000, random_state=1):
+>>>     bl.partial_fit(X)
+>>> results = bl.finalize()
+
+"""
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+
+# Number of values that are drawn with the same child seed
+_BLOCK = 1 << 18
+
+
+# %% Generators
+def generate(size, low=1, high=1e9, dtype='float64', rounding=0.0, multiple=100, substitution=0.0, digit=9, pos=1, thresholding=0.0, limit=None, margin=0.05, random_state=None, n_threads=1):
+    """Generate values that follow Benford's law, optionally with manipulations.
+
+    The log10 of the values is uniformly distributed in [log10(low), log10(high)). The values follow
+    Benford's law for every digit position if high/low is a power of 10. The manipulations are applied
+    in the order: rounding, digit substitution and thresholding.
+
+    Parameters
+    ----------
+    size : int
+        Number of values.
+    low : float, (default: 1)
+        Lowest value, must be positive.
+    high : float, (default: 1e9)
+        Highest value (exclusive).
+    dtype : str or numpy dtype, (default: 'float64')
+        Data type of the output. Integer types are obtained by truncating the values.
+    rounding : float, (default: 0)
+        Fraction of the values that is rounded to a multiple of ``multiple``.
+    multiple : float, (default: 100)
+        Rounding to, e.g. 100 rounds 1234 to 1200.
+    substitution : float, (default: 0)
+        Fraction of the values of which the digit at position ``pos`` is replaced by ``digit``.
+    digit : int, (default: 9)
+        The digit that is substituted.
+    pos : int, (default: 1)
+        Position of the substituted digit (1 is the first digit).
+    thresholding : float, (default: 0)
+        Fraction of the values at or above ``limit`` that is moved to just under the limit.
+    limit : float, (default: None)
+        The limit, e.g. an approval limit. Required if thresholding > 0.
+    margin : float, (default: 0.05)
+        The values are moved uniformly into [limit * (1 - margin), limit).
+    random_state : int, (default: None)
+        Seed.
+    n_threads : int, (default: 1)
+        Number of threads that draw the blocks.
+
+    Returns
+    -------
+    X : ndarray
+
+    Examples
+    --------
+    >>> from benfordslaw.simulate import generate
+    >>> X = generate(1000000, dtype='int64', rounding=0.1, random_state=1)
+
+    """
+    params = _check_params(low, high, dtype, rounding, multiple, substitution, digit, pos, thresholding, limit, margin)
+    return _generate_range(0, int(size), params, np.random.SeedSequence(random_state), n_threads)
+
+
+def generate_chunks(size, chunksize=1000000, random_state=None, n_threads=1, **kwargs):
+    """Generate the values of :func:`generate` in chunks.
+
+    The concatenated chunks are equal to generate(size, random_state=random_state, **kwargs)
+    if random_state is set.
+
+    Parameters
+    ----------
+    size : int
+        Total number of values.
+    chunksize : int, (default: 1000000)
+        Number of values per chunk.
+    random_state : int, (default: None)
+        Seed.
+    n_threads : int, (default: 1)
+        Number of threads that draw the blocks.
+    **kwargs
+        Arguments of :func:`generate`.
+
+    Yields
+    ------
+    X : ndarray
+        Chunk with at most chunksize values.
+
+    Examples
+    --------
+    >>> from benfordslaw import benfordslaw
+    >>> from benfordslaw.simulate import generate_chunks
+    >>> bl = benfordslaw()
+    >>> for X in generate_chunks(10000000, chunksize=1000000, random_state=1):
+    >>>     bl.partial_fit(X)
+    >>> results = bl.finalize()
+
+    """
+    if chunksize < 1: raise ValueError('chunksize must be positive.')
+    params = _check_params(**{**_DEFAULTS, **kwargs})
+    # The entropy is fixed here so that every chunk is drawn from the same seed if random_state is None
+    seed = np.random.SeedSequence(random_state)
+    for start in range(0, int(size), int(chunksize)):
+        yield _generate_range(start, min(start + int(chunksize), int(size)), params, seed, n_threads)
+
+
+_DEFAULTS = dict(low=1, high=1e9, dtype='float64', rounding=0.0, multiple=100, substitution=0.0, digit=9, pos=1, thresholding=0.0, limit=None, margin=0.05)
+
+
+def _check_params(low, high, dtype, rounding, multiple, substitution, digit, pos, thresholding, limit, margin):
+    if not 0 < low < high: raise ValueError('low and high must satisfy 0 < low < high.')
+    dtype = np.dtype(dtype)
+    if dtype.kind not in 'iuf': raise ValueError('dtype must be an integer or float type.')
+    if dtype.kind in 'iu' and high - 1 > np.iinfo(dtype).max: raise ValueError(f'high does not fit in {dtype}.')
+    for name, fraction in [('rounding', rounding), ('substitution', substitution), ('thresholding', thresholding)]:
+        if not 0 <= fraction <= 1: raise ValueError(f'{name} must be a fraction between 0 and 1.')
+    if substitution > 0: _check_digit(digit, pos)
+    if thresholding > 0 and limit is None: raise ValueError('A limit is required for thresholding.')
+    return dict(low=low, high=high, dtype=dtype, rounding=rounding, multiple=multiple, substitution=substitution, digit=digit, pos=pos, thresholding=thresholding, limit=limit, margin=margin)
+
+
+def _check_digit(digit, pos):
+    if pos < 1: raise ValueError('pos must be 1 (first digit) or higher.')
+    if digit not in range(10) or (pos == 1 and digit == 0): raise ValueError(f'digit {digit} is not possible at position {pos}.')
+
+
+def _generate_range(start, stop, params, seed, n_threads):
+    """Generate the values [start, stop) of the stream, drawn per block of _BLOCK values."""
+    out = np.empty(stop - start, dtype=params['dtype'])
+    blocks = range(start // _BLOCK, (stop - 1) // _BLOCK + 1) if stop > start else range(0)
+
+    def fill(block):
+        # The overlap of the block and [start, stop)
+        first, last = max(block * _BLOCK, start), min((block + 1) * _BLOCK, stop)
+        rng = np.random.default_rng(np.random.SeedSequence(seed.entropy, spawn_key=(*seed.spawn_key, block)))
+        out[first - start:last - start] = _generate_block(rng, params, last - block * _BLOCK)[first - block * _BLOCK:]
+
+    with ThreadPoolExecutor(max_workers=max(1, n_threads)) as executor:
+        list(executor.map(fill, blocks))
+    return out
+
+
+def _generate_block(rng, params, size=_BLOCK):
+    """Draw the first size values of a block.
+
+    Without manipulations only the first size values are drawn, which are the same as the first values
+    of the whole block. The manipulations draw from the random stream after the values, so then the
+    whole block is drawn to keep the values independent of the chunks. A chunk that covers a small part
+    of a block then costs as much as the whole block (2^18 values).
+
+    """
+    manipulated = params['rounding'] > 0 or params['substitution'] > 0 or params['thresholding'] > 0
+    # Draw the log10 in place: X = low * exp(u * ln(high / low))
+    X = rng.random(_BLOCK if manipulated else size, dtype=np.float32 if params['dtype'] == np.float32 else np.float64)
+    X *= np.log(params['high'] / params['low'])
+    np.exp(X, out=X)
+    X *= params['low']
+
+    if params['rounding'] > 0:
+        X = round_values(X, params['rounding'], multiple=params['multiple'], random_state=rng)
+    if params['substitution'] > 0:
+        X = substitute_digit(X, params['substitution'], digit=params['digit'], pos=params['pos'], random_state=rng)
+    if params['thresholding'] > 0:
+        X = threshold(X, params['thresholding'], limit=params['limit'], margin=params['margin'], random_state=rng)
+    X = X[:size]
+    if params['dtype'].kind in 'iu':
+        return X.astype(params['dtype'])
+    return X
+
+
+# %% Manipulations
+def round_values(X, fraction=1.0, multiple=100, random_state=None):
+    """Round a fraction of the values to a multiple.
+
+    Parameters
+    ----------
+    X : array-like
+        Values.
+    fraction : float, (default: 1)
+        Fraction of the values that is rounded.
+    multiple : float, (default: 100)
+        Rounding to, e.g. 100 rounds 1234 to 1200.
+    random_state : int or numpy Generator, (default: None)
+        Seed.
+
+    Returns
+    -------
+    X : ndarray
+        Copy of the values with the rounded values.
+
+    """
+    X = _to_float(X)
+    Iloc = _select(len(X), fraction, np.random.default_rng(random_state))
+    X[Iloc] = np.round(X[Iloc] / multiple) * multiple
+    return X
+
+
+def substitute_digit(X, fraction=1.0, digit=9, pos=1, random_state=None):
+    """Replace the digit at a position by another digit for a fraction of the values.
+
+    Values that have no digit at the position (e.g. 7 for the second digit) are not changed.
+
+    Parameters
+    ----------
+    X : array-like
+        Positive values.
+    fraction : float, (default: 1)
+        Fraction of the values that is changed.
+    digit : int, (default: 9)
+        The new digit.
+    pos : int, (default: 1)
+        Position of the digit (1 is the first digit).
+    random_state : int or numpy Generator, (default: None)
+        Seed.
+
+    Returns
+    -------
+    X : ndarray
+        Copy of the values with the substituted digits.
+
+    """
+    _check_digit(digit, pos)
+    X = _to_float(X)
+    Iloc = _select(len(X), fraction, np.random.default_rng(random_state))
+    values = X[Iloc]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        exponent = np.floor(np.log10(values))
+        # Correct for the rounding of log10 just below a power of 10
+        exponent[values < 10.0 ** exponent] -= 1
+        scale = 10.0 ** (exponent - pos + 1)
+        current = np.floor(values / scale) % 10
+    X[Iloc] = np.where(exponent >= pos - 1, values + (digit - current) * scale, values)
+    return X
+
+
+def threshold(X, fraction=1.0, limit=1000, margin=0.05, random_state=None):
+    """Move a fraction of the values at or above a limit to just under the limit.
+
+    Parameters
+    ----------
+    X : array-like
+        Values.
+    fraction : float, (default: 1)
+        Fraction of the values at or above the limit that is moved.
+    limit : float, (default: 1000)
+        The limit, e.g. an approval limit.
+    margin : float, (default: 0.05)
+        The values are moved uniformly into [limit * (1 - margin), limit).
+    random_state : int or numpy Generator, (default: None)
+        Seed.
+
+    Returns
+    -------
+    X : ndarray
+        Copy of the values with the moved values.
+
+    """
+    rng = np.random.default_rng(random_state)
+    X = _to_float(X)
+    Iloc = np.flatnonzero(X >= limit)
+    Iloc = Iloc[_select(len(Iloc), fraction, rng)]
+    X[Iloc] = limit * (1 - margin * rng.random(len(Iloc), dtype=X.dtype))
+    return X
+
+
+def _to_float(X):
+    """Copy of the values as float array."""
+    X = np.asarray(X)
+    return np.array(X, dtype=np.result_type(X.dtype, np.float32))
+
+
+def _select(n, fraction, rng):
+    """Select every index with probability fraction."""
+    if fraction <= 0:
+        return np.empty(0, dtype=np.int64)
+    if fraction >= 1:
+        return np.arange(n)
+    if fraction > 0.25 or n == 0:
+        return np.flatnonzero(rng.random(n, dtype=np.float32) < fraction)
+    # Draw the gaps between the selected indices, which costs time in the number of selected indices only
+    Iloc = np.empty(0, dtype=np.int64)
+    while len(Iloc) == 0 or Iloc[-1] < n:
+        expected = (n - (Iloc[-1] if len(Iloc) else 0)) * fraction
+        gaps = rng.geometric(fraction, size=int(expected + 4 * np.sqrt(expected) + 10))
+        Iloc = np.concatenate([Iloc, np.cumsum(gaps) - 1 + (Iloc[-1] + 1 if len(Iloc) else 0)])
+    return Iloc[:np.searchsorted(Iloc, n)]
@@ -2,9 +2,24 @@
 # pytest test/test_benfordslaw.py
 
 import numpy as np
+import pandas as pd
 from benfordslaw import benfordslaw
 from benfordslaw import compute_excess_mad
+from benfordslaw import compute_excess_mad_batch
+from benfordslaw import DigitCounts
+from benfordslaw.benfordslaw import _get_digits, _get_trailing_digits, _bincount_digits
+from benfordslaw.benfordslaw import _count_digit, _count_position, _get_window
+from benfordslaw.benfordslaw import _get_null_distribution, _ks_test, _kuiper_test, _to_numpy, _get_significant_digits, _parse_numbers, _to_numeric
+from benfordslaw.benfordslaw import _get_cache_path, _write_cache
+from benfordslaw.simulate import generate, generate_chunks, round_values, substitute_digit, threshold
+import importlib.util
+import mmap
+import os
+import subprocess
+import sys
+import tempfile
 import unittest
+import tracemalloc
 
 
 class TestBENFORDSLAW(unittest.TestCase):
@@ -49,8 +64,9 @@ class TestBENFORDSLAW(unittest.TestCase):
         # TEST 3: check ks
         bl = benfordslaw(method='ks')
         out = bl.fit(X)
-        assert out['P']==1.0
-        assert out['t']==0.1111111111111111
+        cdf_emp, cdf_exp = np.cumsum(out['percentage_emp'][:, 1]) / 100, np.cumsum(bl.leading_digits) / 100
+        assert np.isclose(out['t'], np.max(np.abs(cdf_emp - cdf_exp)))
+        assert 0 < out['P'] <= 1
 
         # TEST 4: check percentages
         assert np.all(out['percentage_emp'][:,1]==[31.64521544487969, 16.508114157806382, 12.479015109121432, 9.820928931169558, 7.862339115836598, 6.3794068270845, 5.8477895914941245, 4.616675993284835, 4.8405148293228875])
@@ -163,6 +179,32 @@ class TestExcessMAD(unittest.TestCase):
         # Verify the formula
         assert np.isclose(result['excess_mad'], result['mad'] - result['expected_mad'], rtol=1e-10)
 
+    def test_compute_excess_mad_batch(self):
+        """Test the batched Excess MAD against the standalone function for every column."""
+        rng = np.random.default_rng(9)
+        X = rng.lognormal(mean=5, sigma=2, size=(2000, 5))
+        X[:, 4] = 0.5
+        for pos in ['first_two', 1, -1]:
+            expected = [compute_excess_mad(X[:, i], pos=pos) for i in range(X.shape[1])]
+            for data in [X, list(X.T), pd.DataFrame(X, columns=list('abcde'))]:
+                for n_jobs in [1, 2]:
+                    results = compute_excess_mad_batch(data, pos=pos, n_jobs=n_jobs)
+                    assert results.shape == (5, 5)
+                    for (_, row), result in zip(results.iterrows(), expected):
+                        for key in ['mad', 'expected_mad', 'excess_mad', 'conformity_mad', 'N']:
+                            assert (row[key] == result[key]) or (np.isnan(row[key]) and np.isnan(result[key]))
+        assert list(compute_excess_mad_batch(pd.DataFrame(X, columns=list('abcde'))).index) == list('abcde')
+
+    def test_compute_excess_mad_batch_1d(self):
+        """Test that a 1-D array or Series is one column and that more than 2 dimensions raise."""
+        expected = compute_excess_mad(np.array([123., 456, 789]))
+        for data in [np.array([123., 456, 789]), pd.Series([123., 456, 789], name='value')]:
+            results = compute_excess_mad_batch(data)
+            assert len(results) == 1 and results['N'].iloc[0] == expected['N'] == 3
+            assert results['mad'].iloc[0] == expected['mad']
+        assert list(compute_excess_mad_batch(pd.Series([123., 456, 789], name='value')).index) == ['value']
+        self.assertRaises(ValueError, compute_excess_mad_batch, np.ones((2, 2, 2)))
+
     def test_first_two_digits_90_categories(self):
         """Test that first-two-digits has 90 categories (10-99)."""
         bl = benfordslaw(pos='first_two')
@@ -264,6 +306,26 @@ class TestExcessMAD(unittest.TestCase):
             assert not np.isnan(results['expected_mad']), f"NaN expected_mad for pos={pos}"
             assert not np.isnan(results['excess_mad']), f"NaN excess_mad for pos={pos}"
 
+    def test_benford_distributions(self):
+        """Test that the exact Benford distributions sum to 100% and match the published tables."""
+        for pos in ['first_two', 1, 2, 3, 4, 5, 9, -1]:
+            assert np.isclose(np.sum(benfordslaw(pos=pos).leading_digits), 100.0, rtol=1e-12)
+        assert np.allclose(benfordslaw(pos=2).leading_digits, [12, 11.4, 10.9, 10.4, 10, 9.7, 9.3, 9, 8.8, 8.5], atol=0.05)
+        assert np.allclose(benfordslaw(pos=3).leading_digits, [10.2, 10.1, 10.1, 10.1, 10.0, 10.0, 9.9, 9.9, 9.9, 9.8], atol=0.05)
+        # The distribution approaches the uniform distribution for higher positions
+        assert np.all(np.diff(benfordslaw(pos=5).leading_digits) < 0)
+        assert np.allclose(benfordslaw(pos=9).leading_digits, 10, atol=1e-6)
+
+    def test_excess_mad_constants_derived(self):
+        """Test that the Excess MAD constants are derived from the Benford distributions."""
+        bl = benfordslaw(pos=2)
+        p = np.array(bl.leading_digits) / 100
+        C = len(p) ** 2 * np.pi / (2 * np.sum(np.sqrt(p * (1 - p))) ** 2)
+        assert np.isclose(bl._get_excess_mad_constant(), C, rtol=1e-12)
+        # The derived constant agrees with the published constant for the first-two-digits test
+        p = np.array(benfordslaw(pos='first_two').leading_digits) / 100
+        assert np.isclose(len(p) ** 2 * np.pi / (2 * np.sum(np.sqrt(p * (1 - p))) ** 2), 158.8, atol=0.05)
+
 
 class TestFirstTwoDigits(unittest.TestCase):
     """Test suite for first-two-digits functionality."""
@@ -299,5 +361,802 @@ class TestFirstTwoDigits(unittest.TestCase):
         assert results['N'] == 0
 
 
+class TestPartialFit(unittest.TestCase):
+    """Test suite for incremental fitting."""
+
+    def test_partial_fit_equals_fit(self):
+        """Test that fitting in chunks gives the same results as fitting at once."""
+        X = np.random.default_rng(4).lognormal(mean=5, sigma=2, size=10000)
+        for pos in [1, 2, -1, 'first_two']:
+            results = benfordslaw(pos=pos).fit(X)
+            bl = benfordslaw(pos=pos)
+            for chunk in np.array_split(X, 7):
+                bl.partial_fit(chunk)
+            results_chunks = bl.finalize()
+            assert results_chunks['N'] == results['N']
+            assert np.array_equal(results_chunks['percentage_emp'], results['percentage_emp'])
+            assert results_chunks['P'] == results['P']
+            assert results_chunks['excess_mad'] == results['excess_mad']
+
+    def test_fit_resets_counts(self):
+        """Test that fit resets the running totals."""
+        bl = benfordslaw()
+        bl.partial_fit(np.array([1, 2, 3]))
+        results = bl.fit(np.array([12, 23, 34]))
+        assert results['N'] == 3
+        assert np.array_equal(bl.counts_emp, [1, 1, 1, 0, 0, 0, 0, 0, 0])
+
+    def test_finalize_without_data(self):
+        """Test that finalize without any data returns no observations."""
+        results = benfordslaw().finalize()
+        assert results['N'] == 0
+        assert np.isnan(results['P'])
+
+
+class TestDigitCounts(unittest.TestCase):
+    """Test suite for mergeable digit counts."""
+
+    def test_merge_equals_fit(self):
+        """Test that merged shards give the same results as fitting at once."""
+        X = np.random.default_rng(5).lognormal(mean=5, sigma=2, size=10000)
+        for pos in [1, 3, -2, 'first_two']:
+            shards = [DigitCounts(pos=pos).update(chunk) for chunk in np.array_split(X, 4)]
+            counts = sum(shards)
+            assert counts == shards[0] + shards[1] + shards[2] + shards[3]
+            results = benfordslaw(pos=pos).fit(X)
+            results_counts = benfordslaw(pos=pos).fit_counts(counts)
+            assert results_counts['N'] == results['N'] == counts.total
+            assert np.array_equal(results_counts['percentage_emp'], results['percentage_emp'])
+            assert results_counts['P'] == results['P']
+
+    def test_serialization(self):
+        """Test the round trip to bytes."""
+        for pos in [1, 2, -1, 'first_two']:
+            counts = DigitCounts(pos=pos).update(np.arange(1, 5000))
+            data = counts.to_bytes()
+            assert len(data) == len(DigitCounts(pos=pos).to_bytes())
+            assert DigitCounts.from_bytes(data) == counts
+        with self.assertRaises(ValueError):
+            DigitCounts.from_bytes(b'XXXX' + data[4:])
+
+    def test_merge_different_positions(self):
+        """Test that counts of different digit positions can not be merged."""
+        with self.assertRaises(ValueError):
+            DigitCounts(pos=1) + DigitCounts(pos=2)
+        with self.assertRaises(ValueError):
+            benfordslaw(pos=1).fit_counts(DigitCounts(pos=2))
+
+    def test_get_counts(self):
+        """Test that the running totals of partial_fit are returned as DigitCounts."""
+        bl = benfordslaw()
+        bl.partial_fit(np.array([12, 23, 34]))
+        assert bl.get_counts() == DigitCounts(pos=1, counts=[1, 1, 1, 0, 0, 0, 0, 0, 0])
+
+
+class TestFitGroups(unittest.TestCase):
+    """Test suite for the grouped fit."""
+
+    def setUp(self):
+        rng = np.random.default_rng(6)
+        self.df = pd.DataFrame({'value': rng.lognormal(mean=5, sigma=2, size=20000),
+                                'vendor': rng.choice(['a', 'b', 'c', 'd'], size=20000),
+                                'year': rng.choice([2020, 2021], size=20000)})
+        # A group without valid values
+        self.df.loc[self.df['vendor'] == 'd', 'value'] = 0.5
+
+    def test_fit_groups_equals_fit(self):
+        """Test that the grouped results are the same as fitting each group separately."""
+        for pos in [1, 2, -1, 'first_two']:
+            for method in ['chi2', 'ks', 'mad', None]:
+                results = benfordslaw(pos=pos, method=method).fit_groups(self.df, value_col='value', by='vendor')
+                assert list(results.index) == ['a', 'b', 'c', 'd']
+                for vendor, row in results.iterrows():
+                    out = benfordslaw(pos=pos, method=method).fit(self.df.loc[self.df['vendor'] == vendor, 'value'].values)
+                    for key in ['N', 'P', 't', 'P_significant', 'mad', 'expected_mad', 'excess_mad', 'conformity_mad']:
+                        assert (row[key] == out[key]) or (np.isnan(row[key]) and np.isnan(out[key])), f"Mismatch in {key} for pos={pos}, method={method}, vendor={vendor}"
+
+    def test_fit_groups_multiple_columns(self):
+        """Test grouping on multiple columns."""
+        bl = benfordslaw()
+        results = bl.fit_groups(self.df, value_col='value', by=['vendor', 'year'])
+        assert results.shape[0] == 8
+        assert results.loc[('d', 2020), 'conformity_mad'] == 'insufficient data'
+        assert np.array_equal(bl.counts_groups.sum(axis=1).values, results['N'].values)
+
+    def test_fit_groups_n_jobs(self):
+        """Test that the process-pool mode gives the same results in the same order."""
+        for method in ['chi2', 'ks']:
+            bl = benfordslaw(pos='first_two', method=method)
+            results = bl.fit_groups(self.df, value_col='value', by=['vendor', 'year'])
+            counts = bl.counts_groups
+            results_jobs = bl.fit_groups(self.df, value_col='value', by=['vendor', 'year'], n_jobs=3)
+            pd.testing.assert_frame_equal(results, results_jobs)
+            pd.testing.assert_frame_equal(counts, bl.counts_groups)
+
+    def test_compute_excess_mad_n_jobs(self):
+        """Test that compute_excess_mad gives the same results with multiple processes."""
+        result = compute_excess_mad(self.df['value'].values, pos=1)
+        result_jobs = compute_excess_mad(self.df['value'].values, pos=1, n_jobs=2)
+        assert result == result_jobs
+
+
+class TestFitFile(unittest.TestCase):
+    """Test suite for fitting files in chunks."""
+
+    def setUp(self):
+        rng = np.random.default_rng(7)
+        self.df = pd.DataFrame({'amount': rng.lognormal(mean=5, sigma=2, size=5000).round(2),
+                                'vendor': rng.choice(['x', 'y', 'z'], size=5000),
+                                'year': rng.choice([2020, 2021], size=5000)})
+        self.tmpdir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def _check(self, path):
+        results = benfordslaw(pos='first_two').fit(self.df['amount'].values)
+        results_file = benfordslaw(pos='first_two').fit_file(path, column='amount', chunksize=700)
+        assert results_file['N'] == results['N']
+        assert results_file['P'] == results['P']
+        for by in ['vendor', ['vendor', 'year']]:
+            results = benfordslaw().fit_groups(self.df, value_col='amount', by=by)
+            results_file = benfordslaw().fit_file(path, column='amount', chunksize=700, by=by)
+            pd.testing.assert_frame_equal(results, results_file, check_index_type=False)
+
+    def test_csv(self):
+        path = os.path.join(self.tmpdir.name, 'data.csv')
+        self.df.to_csv(path, index=False)
+        self._check(path)
+
+    @unittest.skipUnless(importlib.util.find_spec('pyarrow'), 'pyarrow is not installed')
+    def test_parquet(self):
+        path = os.path.join(self.tmpdir.name, 'data.parquet')
+        self.df.to_parquet(path, row_group_size=1000)
+        self._check(path)
+
+
+class TestMemmap(unittest.TestCase):
+    """Test suite for memory-mapped input."""
+
+    def setUp(self):
+        self.X = np.random.default_rng(8).lognormal(mean=5, sigma=3, size=300000)
+        self.tmpdir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_npy_and_raw(self):
+        """Test that memory-mapped files give the same results as the in-memory array."""
+        path_npy = os.path.join(self.tmpdir.name, 'data.npy')
+        path_raw = os.path.join(self.tmpdir.name, 'data.bin')
+        np.save(path_npy, self.X)
+        self.X.astype(np.int64).tofile(path_raw)
+        for pos in [1, -2, 'first_two']:
+            bl = benfordslaw(pos=pos)
+            results = bl.fit(self.X)
+            assert np.array_equal(bl.fit(path_npy)['percentage_emp'], results['percentage_emp'])
+            assert np.array_equal(bl.fit(np.load(path_npy, mmap_mode='r'))['percentage_emp'], results['percentage_emp'])
+            results = bl.fit(self.X.astype(np.int64))
+            assert np.array_equal(bl.fit(path_raw, dtype='int64')['percentage_emp'], results['percentage_emp'])
+        with self.assertRaises(ValueError):
+            benfordslaw().fit(path_raw)
+
+    def test_windows(self):
+        """Test that the windowed counting gives the same counts as counting at once."""
+        X = np.tile(self.X, 4)
+        window = _get_window(X.itemsize)
+        assert (window * X.itemsize) % mmap.PAGESIZE == 0
+        assert len(X) > window
+        counts, _, _, _ = _count_digit(X, 2, range(0, 10))
+        assert np.array_equal(_count_position(X, 2, range(0, 10)), counts)
+
+
+class TestFitRolling(unittest.TestCase):
+    """Test suite for the rolling window statistics."""
+
+    def setUp(self):
+        self.X = np.random.default_rng(10).lognormal(mean=5, sigma=2, size=3000)
+        self.X[:50] = 0.5
+
+    def _check_window(self, row, X, pos):
+        out = benfordslaw(pos=pos, method='chi2').fit(X)
+        assert row['N'] == out['N']
+        if out['N'] == 0:
+            assert np.isnan(row['mad']) and row['conformity_mad'] == 'insufficient data'
+            return
+        assert np.isclose(row['mad'], out['mad'], rtol=1e-10)
+        assert np.isclose(row['excess_mad'], out['excess_mad'], rtol=1e-10)
+        assert np.isclose(row['t'], out['t'], rtol=1e-10)
+        assert np.isclose(row['P'], out['P'], rtol=1e-8)
+        assert row['conformity_mad'] == out['conformity_mad']
+
+    def test_count_window(self):
+        """Test that each window equals a fit on the last N values."""
+        for pos in [1, 'first_two']:
+            results = benfordslaw(pos=pos).fit_rolling(self.X, window=500)
+            assert len(results) == len(self.X)
+            for i in [0, 40, 100, 499, 500, 1777, 2999]:
+                self._check_window(results.iloc[i], self.X[max(0, i - 499):i + 1], pos)
+
+    def test_time_window(self):
+        """Test that each window equals a fit on the values in the last T minutes."""
+        times = pd.Timestamp('2024-01-01') + pd.to_timedelta(np.sort(np.random.default_rng(11).uniform(0, 600, size=len(self.X))), unit='min')
+        window = pd.Timedelta(minutes=30)
+        results = benfordslaw(pos=2).fit_rolling(self.X, window=window, times=times)
+        assert (results.index == times).all()
+        for i in [0, 60, 1000, 2999]:
+            Iloc = (times > times[i] - window) & (times <= times[i])
+            self._check_window(results.iloc[i], self.X[Iloc], 2)
+
+
+class TestMonteCarlo(unittest.TestCase):
+    """Test suite for the Monte-Carlo P-values."""
+
+    def setUp(self):
+        self.X = np.random.default_rng(12).lognormal(mean=5, sigma=2, size=2000)
+
+    def test_close_to_asymptotic(self):
+        """Test that the simulated chi-square P-value is close to the asymptotic P-value for large N."""
+        out = benfordslaw(method='chi2').fit(self.X)
+        out_mc = benfordslaw(method='chi2', n_simulations=20000, random_state=1).fit(self.X)
+        assert np.isclose(out_mc['t'], out['t'], rtol=1e-10)
+        assert abs(out_mc['P'] - out['P']) < 0.02
+
+    def test_reproducible(self):
+        """Test that the outcome depends on the seed but not on the number of threads."""
+        for method in ['chi2', 'ks', 'mad', None]:
+            out = benfordslaw(method=method, n_simulations=2500, random_state=2).fit(self.X[:100])
+            out_threads = benfordslaw(method=method, n_simulations=2500, random_state=2, n_threads=3).fit(self.X[:100])
+            assert out['P'] == out_threads['P']
+            assert 0 < out['P'] <= 1
+
+    def test_cache_and_groups(self):
+        """Test that groups of the same size reuse the simulated distribution."""
+        df = pd.DataFrame({'value': self.X, 'group': np.repeat(np.arange(20), 100)})
+        _get_null_distribution.cache_clear()
+        bl = benfordslaw(pos='first_two', method='chi2', n_simulations=1000, random_state=3)
+        results = bl.fit_groups(df, value_col='value', by='group')
+        assert _get_null_distribution.cache_info().currsize == len(np.unique(results['N']))
+        for group in [0, 7]:
+            out = bl.fit(df.loc[df['group'] == group, 'value'].values)
+            assert results.loc[group, 'P'] == out['P']
+
+
+class TestDiscreteKS(unittest.TestCase):
+    """Test suite for the discrete KS and Kuiper tests on digit counts."""
+
+    def setUp(self):
+        self.p = benfordslaw().leading_digits / 100
+
+    def test_statistics(self):
+        """Test the statistics against a direct computation on the cumulative proportions."""
+        counts = np.array([[30, 18, 12, 10, 8, 7, 6, 5, 4], [10, 10, 10, 10, 10, 10, 10, 10, 10]])
+        counts_exp = counts.sum(axis=1)[:, None] * self.p
+        for row, (D, V) in zip(counts, zip(_ks_test(counts, counts_exp)[0], _kuiper_test(counts, counts_exp)[0])):
+            diff = np.cumsum(row / row.sum()) - np.cumsum(self.p)
+            assert np.isclose(D, np.max(np.abs(diff)))
+            assert np.isclose(V, max(diff.max(), 0) + max(-diff.min(), 0))
+
+    def test_pvalues(self):
+        """Test that Benford data is not rejected and uniform digits are rejected."""
+        X = 10 ** np.random.default_rng(5).uniform(2, 8, size=20000)
+        for method in ['ks', 'kuiper', None]:
+            assert benfordslaw(method=method).fit(X)['P'] > 0.01
+            assert benfordslaw(method=method).fit(np.arange(1, 10).repeat(100))['P'] < 1e-6
+
+    def test_unknown_method(self):
+        """Test that an unknown method raises a ValueError."""
+        with self.assertRaisesRegex(ValueError, 'method kolmogorov is not supported'):
+            benfordslaw(method='kolmogorov')
+
+    def test_groups(self):
+        """Test that the vectorized groups give the same result as separate fits."""
+        rng = np.random.default_rng(6)
+        df = pd.DataFrame({'value': rng.lognormal(mean=4, sigma=2, size=3000), 'group': rng.integers(0, 5, size=3000)})
+        for method in ['ks', 'kuiper']:
+            bl = benfordslaw(method=method)
+            results = bl.fit_groups(df, value_col='value', by='group')
+            out = bl.fit(df.loc[df['group'] == 3, 'value'].values)
+            assert np.isclose(results.loc[3, 't'], out['t'])
+            assert np.isclose(results.loc[3, 'P'], out['P'])
+
+    def test_monte_carlo(self):
+        """Test that the asymptotic P-values are conservative compared to the Monte-Carlo P-values."""
+        X = np.random.default_rng(7).lognormal(mean=5, sigma=2, size=2000)
+        for method in ['ks', 'kuiper']:
+            out = benfordslaw(method=method).fit(X)
+            out_mc = benfordslaw(method=method, n_simulations=5000, random_state=1).fit(X)
+            assert np.isclose(out_mc['t'], out['t'])
+            assert out_mc['P'] <= out['P']
+
+
+class TestImport(unittest.TestCase):
+    """Test suite for the imports of the package."""
+
+    def test_import_is_lightweight(self):
+        """Test that importing benfordslaw does not import the heavy dependencies."""
+        code = ("import sys, benfordslaw; "
+                "print(','.join(m for m in ['pandas', 'scipy', 'matplotlib', 'datazets'] if m in sys.modules))")
+        cwd = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        out = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True, cwd=cwd).stdout.strip()
+        assert out == '', f"Heavy dependencies are imported: {out}"
+
+
+class TestDigitExtraction(unittest.TestCase):
+    """Test suite for the vectorized digit extraction."""
+
+    @staticmethod
+    def _get_digits_str(data, d):
+        """String based reference implementation."""
+        digits = np.full(data.shape, -1, dtype=np.int64)
+        Iloc = data >= np.power(10, d - 1)
+        digits[Iloc] = list(map(lambda x: int(str(x)[d - 1]), data[Iloc]))
+        return digits
+
+    def test_identical_to_string_path(self):
+        """Test that the arithmetic extraction equals the string based extraction for integers."""
+        rng = np.random.default_rng(1)
+        data = np.r_[rng.integers(1, 10**18, size=10000), 10 ** np.arange(19), 10 ** np.arange(1, 19) - 1, np.iinfo(np.int64).max]
+        for d in range(1, 20):
+            assert np.array_equal(_get_digits(data, d), self._get_digits_str(data, d)), f"Mismatch for digit {d}"
+
+    def test_trailing_digits(self):
+        """Test the last digits against the string representation, including trailing zeros."""
+        rng = np.random.default_rng(3)
+        data = np.r_[rng.integers(1, 10**12, size=10000), 1230, 1000, 10, 7]
+        for d in range(1, 10):
+            expected = np.array([int(str(x)[-d]) if len(str(x)) >= d else -1 for x in data])
+            assert np.array_equal(_get_trailing_digits(data, d), expected), f"Mismatch for digit -{d}"
+        assert np.array_equal(_get_trailing_digits(np.array([1230, 1000, 10, 7]), 1), [0, 0, 0, 7])
+        assert np.array_equal(_get_trailing_digits(np.array([1230, 1000, 10, 7]), 2), [3, 0, 1, -1])
+
+    def test_last_digit_fit(self):
+        """Test that the last digit test counts trailing zeros."""
+        bl = benfordslaw(pos=-1)
+        results = bl.fit(np.array([10, 20, 31, 42, 1230, 57.0]))
+        assert results['N'] == 6
+        assert np.array_equal(results['percentage_emp'][:, 1], np.array([3, 1, 1, 0, 0, 0, 0, 1, 0, 0]) / 6 * 100)
+
+    def test_floats(self):
+        """Test that floats are truncated to their integer part."""
+        data = np.array([1.5, 12.9, 987.654, 99.999, np.nan, np.inf, 0.5])
+        assert np.array_equal(_get_digits(data, 1), [1, 1, 9, 9, -1, -1, -1])
+        assert np.array_equal(_get_digits(data, 2), [-1, 2, 8, 9, -1, -1, -1])
+
+    def test_bincount_digits(self):
+        """Test that the histogram kernel returns integer counts and ignores digits outside the range."""
+        counts, percentage, total, digit = _bincount_digits(np.array([-1, 1, 1, 9, 0, 5]), range(1, 10))
+        assert counts.dtype == np.int64
+        assert np.array_equal(counts, [2, 0, 0, 0, 1, 0, 0, 0, 1])
+        assert total == 4
+        assert np.array_equal(percentage, counts / 4 * 100)
+        assert digit == list(range(1, 10))
+        counts, percentage, total, _ = _bincount_digits(np.array([-1, -1]), range(10, 100))
+        assert total == 0 and len(counts) == 90 and np.all(np.isnan(percentage))
+
+
+
+class TestBenchmarks(unittest.TestCase):
+    """Test suite for the benchmarks."""
+
+    def test_run_and_compare(self):
+        """Test that the benchmarks run and that a regression is detected."""
+        from benfordslaw.benchmarks.bench import run, compare
+        results = run(sizes=[1e3], repeat=1, pattern='^import$|count_digit|fit\\[method=chi2,pos=1\\]', verbose=False)
+        assert set(results['results']) == {f'count_digit[pos={pos},{kind}]@1e+03' for pos in [1, 2, -1] for kind in ['benford', 'uniform']} | {'fit[method=chi2,pos=1]@1e+03', 'import@1e+00'}
+        assert all(result['throughput'] > 0 and result['peak_memory_mb'] > 0 for result in results['results'].values())
+        assert compare(results, results) == []
+        slower = {'meta': results['meta'], 'results': {key: dict(result, seconds=result['seconds'] / 2) for key, result in results['results'].items()}}
+        assert len(compare(results, slower)) == len(results['results'])
+
+
+class TestSimulate(unittest.TestCase):
+    """Test suite for the synthetic data generator."""
+
+    def test_benford(self):
+        """Test that the generated data follows Benford's law for every digit position."""
+        for dtype in ['float64', 'float32', 'int64']:
+            X = generate(200000, low=10, high=1e8, dtype=dtype, random_state=1)
+            assert X.dtype == dtype and X.min() >= 10 and X.max() < 1e8
+            for pos in [1, 2, 'first_two']:
+                assert benfordslaw(pos=pos, method='chi2').fit(X)['P'] > 0.001
+
+    def test_reproducible(self):
+        """Test that the data only depends on the seed, not on the chunksize or the threads."""
+        kwargs = dict(rounding=0.1, substitution=0.1, thresholding=0.5, limit=5000)
+        X = generate(600001, random_state=2, **kwargs)
+        assert np.array_equal(X, generate(600001, random_state=2, n_threads=3, **kwargs))
+        chunks = list(generate_chunks(600001, chunksize=250000, random_state=2, **kwargs))
+        assert [len(chunk) for chunk in chunks] == [250000, 250000, 100001]
+        assert np.array_equal(X, np.concatenate(chunks))
+        assert not np.array_equal(X, generate(600001, random_state=3, **kwargs))
+        # Without manipulations only the used part of a block is drawn
+        X = generate(300001, random_state=2)
+        assert np.array_equal(X, np.concatenate(list(generate_chunks(300001, chunksize=1000, random_state=2))))
+
+    def test_manipulations(self):
+        """Test the rounding, digit substitution and thresholding."""
+        assert np.all(round_values([1234, 1251, 40]) == [1200, 1300, 0])
+        assert np.all(substitute_digit([1234, 5, 99.5], digit=7) == [7234, 7, 79.5])
+        assert np.all(substitute_digit([1234, 5, 99.5], digit=7, pos=2) == [1734, 5, 97.5])
+        X = threshold([100, 6000, 7000], limit=5000, margin=0.1)
+        assert X[0] == 100 and np.all((X[1:] >= 4500) & (X[1:] < 5000))
+        self.assertRaises(ValueError, substitute_digit, [1234], digit=0, pos=1)
+        for manipulate in [round_values, substitute_digit, threshold]:
+            assert np.all(manipulate([1234, 5, 99.5], fraction=0) == [1234, 5, 99.5])
+        self.assertRaises(ValueError, generate, 10, thresholding=0.1)
+
+    def test_detected(self):
+        """Test that a digit substitution of 5% is detected by the fit."""
+        X = generate(100000, substitution=0.05, digit=9, random_state=4)
+        out = benfordslaw(method='chi2').fit(X)
+        assert out['P'] < 1e-6
+        assert np.isclose(out['percentage_emp'][-1, 1], 0.95 * 100 * np.log10(10 / 9) + 5, atol=0.5)
+
+
+class TestProfile(unittest.TestCase):
+    """Test suite for the timings of the stages of the fit."""
+
+    def setUp(self):
+        self.X = generate(100000, random_state=1)
+
+    def test_timings(self):
+        """Test that every stage is timed and that the results do not change."""
+        out = benfordslaw(profile=True).fit(self.X)
+        assert set(out['timings']) == {'convert', 'extract', 'count', 'statistics', 'test', 'logging'}
+        assert all(seconds >= 0 for seconds in out['timings'].values())
+        assert 'allocated_bytes' not in out
+        ref = benfordslaw().fit(self.X)
+        assert 'timings' not in ref
+        assert ref['P'] == out['P'] and np.all(ref['percentage_emp'] == out['percentage_emp'])
+
+    def test_memory(self):
+        """Test that the allocated bytes are recorded and that the tracing is stopped afterwards."""
+        out = benfordslaw(pos='first_two', profile='memory').fit(self.X)
+        assert out['allocated_bytes']['extract'] >= self.X.nbytes
+        assert not tracemalloc.is_tracing()
+
+    def test_metrics(self):
+        """Test that the metrics sink receives every stage, also for partial_fit."""
+        records = []
+        bl = benfordslaw(metrics=lambda stage, seconds, nbytes: records.append((stage, seconds, nbytes)))
+        for X in np.array_split(self.X, 4):
+            bl.partial_fit(X)
+        out = bl.finalize()
+        assert [stage for stage, _, _ in records] == list(out['timings'])
+        assert {'convert', 'extract', 'count', 'statistics', 'test'} <= set(out['timings'])
+        assert all(nbytes is None for _, _, nbytes in records)
+
+
+class TestPandasInput(unittest.TestCase):
+    """Test suite for Series and DataFrame input."""
+
+    def setUp(self):
+        rng = np.random.default_rng(8)
+        self.df = pd.DataFrame({'a': generate(5000, random_state=1),
+                                'b': rng.integers(1, 10000, size=5000),
+                                'c': pd.array(rng.integers(1, 1000, size=5000), dtype='Int64'),
+                                })
+        self.df.loc[::7, 'c'] = pd.NA
+
+    def test_zero_copy(self):
+        """Test that the values of numpy-backed Series and Index are not copied."""
+        for X in [self.df['a'], self.df['b'], pd.Index(self.df['b'])]:
+            assert np.shares_memory(_to_numpy(X), X.to_numpy())
+
+    def test_nullable(self):
+        """Test that missing values of nullable columns are ignored."""
+        out = benfordslaw().fit(self.df['c'])
+        ref = benfordslaw().fit(self.df['c'].dropna().to_numpy(dtype='int64'))
+        assert out['N'] == ref['N'] == self.df['c'].notna().sum()
+        assert np.all(out['percentage_emp'] == ref['percentage_emp'])
+
+    def test_pooled(self):
+        """Test that fit on a DataFrame pools the columns."""
+        out = benfordslaw(pos='first_two').fit(self.df[['a', 'b']])
+        ref = benfordslaw(pos='first_two').fit(np.r_[self.df['a'].to_numpy(), self.df['b'].to_numpy()])
+        assert out['N'] == ref['N'] and out['P'] == ref['P']
+
+    def test_fit_columns(self):
+        """Test that the per-column results are equal to a fit per column."""
+        bl = benfordslaw(method='chi2')
+        results = bl.fit_columns(self.df)
+        assert list(results.index) == ['a', 'b', 'c']
+        assert bl.counts_groups.shape == (3, 9)
+        for col in self.df.columns:
+            out = benfordslaw(method='chi2').fit(self.df[col])
+            assert results.loc[col, 'N'] == out['N']
+            assert np.isclose(results.loc[col, 'P'], out['P'])
+            assert np.isclose(results.loc[col, 'excess_mad'], out['excess_mad'])
+        assert list(bl.fit_columns(self.df, columns=['b']).index) == ['b']
+
+
+class TestNormalize(unittest.TestCase):
+    """Test suite for the significant digits of normalized values."""
+
+    def test_significant_digits(self):
+        """Test the significant digits of small, negative, rounded and extreme values."""
+        X = np.array([0.00437, -4370, 1e-05, 0.3, 0.1 + 0.2, 1000., 5e-324, 1.7976931348623157e308, 0, np.nan, -np.inf])
+        assert np.all(_get_significant_digits(X, 1) == [4, 4, 1, 3, 3, 1, 4, 1, -1, -1, -1])
+        assert np.all(_get_significant_digits(X, 2) == [43, 43, 10, 30, 30, 10, 49, 17, -1, -1, -1])
+        assert np.all(_get_significant_digits(np.array([-1234, 5, 0]), 2) == [12, 50, -1])
+
+    def test_precision(self):
+        """Test that the 15th significant digit is kept and that later positions raise."""
+        assert _get_significant_digits([3.14159265358979], 15)[0] == 314159265358979
+        assert np.all(_get_significant_digits([3.14159265358979, 0.1 + 0.2], 14) == [31415926535897, 30000000000000])
+        self.assertRaises(ValueError, _get_significant_digits, [3.14159265358979], 16)
+        self.assertRaises(ValueError, benfordslaw, pos=16, normalize=True)
+        assert benfordslaw(pos=16).pos == 16
+
+    def test_against_strings(self):
+        """Test that the digits are equal to the digits of the scientific notation."""
+        rng = np.random.default_rng(9)
+        X = 10 ** rng.uniform(-300, 300, size=20000) * rng.choice([-1, 1], size=20000)
+        expected = [int(f'{abs(x):.13e}'[0] + f'{abs(x):.13e}'[2]) for x in X]
+        assert np.all(_get_significant_digits(X, 2) == expected)
+
+    def test_fit(self):
+        """Test that scaled data gives the same result with normalize=True and that the default is not changed."""
+        X = generate(10000, low=1e3, high=1e9, random_state=2)
+        for pos in [1, 2, 'first_two']:
+            ref = benfordslaw(pos=pos).fit(X)
+            for scale in [1e-7, -1, -1e-3]:
+                out = benfordslaw(pos=pos, normalize=True).fit(X * scale)
+                assert out['N'] == ref['N'] and np.all(out['percentage_emp'] == ref['percentage_emp'])
+        # Without normalization the values below 10 have no first two digits
+        assert benfordslaw(pos='first_two').fit(X * 1e-9)['N'] == 0
+
+    def test_int_float(self):
+        """Test that integer and float input give the same counts in every entry point."""
+        X = np.concatenate([generate(5000, dtype='int64', random_state=5), np.arange(-20, 20)])
+        for pos in [1, 2, 3, 'first_two']:
+            ref = benfordslaw(pos=pos, normalize=True).fit(X.astype(float))
+            assert np.all(benfordslaw(pos=pos, normalize=True).fit(X)['percentage_emp'] == ref['percentage_emp'])
+            assert np.all(DigitCounts(pos=pos).update(X, normalize=True).counts == DigitCounts(pos=pos).update(X.astype(float), normalize=True).counts)
+        out = compute_excess_mad(X, normalize=True)
+        assert out['N'] == compute_excess_mad(X.astype(float), normalize=True)['N'] == len(X) - 1
+        assert compute_excess_mad(X)['N'] < out['N']
+        batch = compute_excess_mad_batch([X, X.astype(float)], normalize=True)
+        assert np.all(batch['N'] == out['N']) and batch['mad'].nunique() == 1
+
+    def test_groups(self):
+        """Test that fit_groups and fit_rolling use the normalized values."""
+        df = pd.DataFrame({'value': generate(3000, random_state=3) * 1e-9, 'group': np.arange(3000) % 3})
+        bl = benfordslaw(normalize=True)
+        results = bl.fit_groups(df, value_col='value', by='group')
+        assert results['N'].sum() == 3000
+        assert np.isclose(results.loc[1, 'P'], bl.fit(df.loc[df['group'] == 1, 'value'])['P'])
+        assert bl.fit_rolling(df['value'].to_numpy(), window=100)['N'].iloc[-1] == 100
+
+
+class TestParseText(unittest.TestCase):
+    def test_formats(self):
+        """Test the parsing of formatted numbers and the number of rejected values."""
+        X = np.array(['1,234.56', '$ 1,234.56', '€1.234', '1 234', '1 234', "1'234", '(12.50)', '-7', '7-',
+                      'USD 45', '3e3', '.5', '12 ', None, '', '  ', 'abc', '12,34', '2021-01-05', '1.2.3', '1,2345'], dtype=object)
+        values, n_rejected = _parse_numbers(X)
+        expected = [1234.56, 1234.56, 1.234, 1234, 1234, 1234, -12.5, -7, -7, 45, 3000, 0.5, 12]
+        assert np.allclose(values[:13], expected)
+        assert np.all(np.isnan(values[13:]))
+        assert n_rejected == 5
+
+    def test_fit(self):
+        """Test that fit on text gives the same result as fit on the numbers."""
+        X = generate(5000, dtype='int64', random_state=4)
+        text = np.array([f'$ {x:,}' for x in X] + ['n/a', ''], dtype=object)
+        for pos in [1, 2, 'first_two']:
+            ref = benfordslaw(pos=pos).fit(X)
+            out = benfordslaw(pos=pos).fit(text)
+            assert out['N'] == ref['N'] and out['n_rejected'] == 1
+            assert np.all(out['percentage_emp'] == ref['percentage_emp'])
+        assert benfordslaw().fit(X)['n_rejected'] == 0
+        out = benfordslaw().fit(pd.Series(text, dtype='string'))
+        assert out['N'] == len(X) and out['n_rejected'] == 1
+
+    def test_partial_fit(self):
+        """Test that the rejected values are summed over the chunks and reset by fit."""
+        bl = benfordslaw()
+        bl.partial_fit(np.array(['12', 'x'], dtype=object))
+        bl.partial_fit(['34', 'y', 'z'])
+        assert bl.finalize()['n_rejected'] == 3
+        assert bl.fit(['12', '34'])['n_rejected'] == 0
+
+    def test_negative(self):
+        """Test that negative text is counted as rejected unless normalize uses the absolute values."""
+        out = benfordslaw().fit(['(1 200)', '1 200'])
+        assert out['N'] == 1 and out['n_rejected'] == 1
+        out = benfordslaw(normalize=True).fit(['(1 200)', '1 200'])
+        assert out['N'] == 2 and out['n_rejected'] == 0
+        assert benfordslaw(pos=-1, normalize=True).fit(['-7', '7'])['n_rejected'] == 1
+
+    def test_columns(self):
+        """Test text columns in fit_columns and fit_groups."""
+        X = generate(3000, dtype='int64', random_state=5)
+        df = pd.DataFrame({'text': [f'{x:,}' for x in X], 'value': X, 'group': np.arange(3000) % 3})
+        df.loc[0, 'text'] = 'unknown'
+        results = benfordslaw().fit_columns(df[['text', 'value']])
+        assert list(results['n_rejected']) == [1, 0]
+        assert results.loc['text', 'N'] == 2999
+        df.loc[4, 'text'] = '(1,200)'
+        for n_jobs in [1, 2]:
+            results = benfordslaw().fit_groups(df, value_col='text', by='group', n_jobs=n_jobs)
+            assert results['N'].sum() == 2998 and list(results['n_rejected']) == [1, 1, 0]
+        assert list(benfordslaw(normalize=True).fit_groups(df, value_col='text', by='group')['n_rejected']) == [1, 0, 0]
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, 'text.csv')
+            df.to_csv(path, index=False)
+            results = benfordslaw().fit_file(path, column='text', by='group', chunksize=1000)
+            assert results['N'].sum() == 2998 and list(results['n_rejected']) == [1, 1, 0]
+
+
+@unittest.skipUnless(importlib.util.find_spec('pyarrow'), 'pyarrow is not installed')
+class TestArrowInput(unittest.TestCase):
+    def setUp(self):
+        import pyarrow as pa
+        self.X = generate(10000, dtype='int64', random_state=6)
+        self.ref = benfordslaw(pos='first_two').fit(self.X)
+        self.chunked = pa.chunked_array([self.X[:3000], self.X[3000:]])
+
+    def test_fit(self):
+        """Test that Arrow arrays, chunked arrays and tables give the same result as numpy input."""
+        import pyarrow as pa
+        text = [f'{x:,}' for x in self.X]
+        for X in [pa.array(self.X), self.chunked, pa.table({'a': self.chunked}), pa.array(self.X).dictionary_encode(),
+                  pa.chunked_array([pa.array(text[:5000]), pa.array(text[5000:])]), pa.array(text, type=pa.large_string())]:
+            out = benfordslaw(pos='first_two').fit(X)
+            assert out['N'] == self.ref['N'] and np.all(out['percentage_emp'] == self.ref['percentage_emp'])
+        # Missing values have no digits
+        assert benfordslaw().fit(pa.array([1, None, 23]))['N'] == 2
+
+    def test_zero_copy(self):
+        """Test that numbers without missing values are read from the Arrow buffer."""
+        import pyarrow as pa
+        X = pa.array(self.X)
+        assert np.shares_memory(_to_numeric(X)[0], np.frombuffer(X.buffers()[1], dtype=np.int64))
+
+    def test_groups(self):
+        """Test fit_groups, fit_columns and compute_excess_mad_batch on an Arrow table."""
+        import pyarrow as pa
+        df = pd.DataFrame({'value': self.X, 'group': np.arange(10000) % 7, 'key': np.where(np.arange(10000) % 3 == 0, 'a', 'b')})
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        table = pa.concat_tables([table.slice(0, 4000), table.slice(4000)])
+        for by in ['group', ['group', 'key']]:
+            ref = benfordslaw().fit_groups(df, value_col='value', by=by)
+            out = benfordslaw().fit_groups(table, value_col='value', by=by)
+            assert out.index.equals(ref.index) and out['N'].equals(ref['N']) and np.allclose(out['P'], ref['P'])
+        ref = benfordslaw().fit_groups(df, value_col='value', by='group')
+        assert np.allclose(benfordslaw().fit_groups(table, value_col='value', by='group', n_jobs=2)['P'], ref['P'])
+        assert benfordslaw().fit_columns(table, columns=['value'])['N'].iloc[0] == len(self.X)
+        assert compute_excess_mad_batch(table.select(['value']))['N'].iloc[0] == self.ref['N']
+
+    def test_parquet(self):
+        """Test that fit_file reads the Parquet batches without conversion to pandas."""
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        df = pd.DataFrame({'value': self.X, 'group': np.arange(10000) % 7})
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, 'data.parquet')
+            pq.write_table(pa.Table.from_pandas(df, preserve_index=False), path)
+            assert benfordslaw(pos='first_two').fit_file(path, column='value', chunksize=3000)['N'] == self.ref['N']
+            out = benfordslaw().fit_file(path, column='value', by='group', chunksize=3000)
+            assert out['N'].equals(benfordslaw().fit_groups(df, value_col='value', by='group')['N'])
+
+    @unittest.skipUnless(importlib.util.find_spec('polars'), 'polars is not installed')
+    def test_polars(self):
+        """Test Polars Series and DataFrames."""
+        import polars as pl
+        out = benfordslaw(pos='first_two').fit(pl.Series('value', self.X))
+        assert np.all(out['percentage_emp'] == self.ref['percentage_emp'])
+        df = pl.DataFrame({'value': self.X, 'group': np.arange(10000) % 7})
+        assert benfordslaw().fit_groups(df, value_col='value', by='group')['N'].sum() == len(self.X)
+
+
+class TestPlot(unittest.TestCase):
+    def setUp(self):
+        import matplotlib
+        matplotlib.use('Agg')
+        X = generate(6000, dtype='int64', random_state=7)
+        self.df = pd.DataFrame({'value': X, 'group': np.arange(6000) % 3})
+
+    def test_plot(self):
+        """Test that plot saves the figure without showing it and labels every bar."""
+        import matplotlib.pyplot as plt
+        bl = benfordslaw()
+        results = bl.fit(self.df['value'])
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, 'chart.png')
+            fig, ax = bl.plot(show=False, savepath=path)
+            assert os.path.getsize(path) > 0
+        assert [text.get_text() for text in ax.texts] == ['{:0.1f}%'.format(perc) for perc in results['percentage_emp'][:, 1]]
+        assert np.allclose([rect.get_height() for rect in ax.patches], results['percentage_emp'][:, 1])
+        plt.close(fig)
+
+    def test_plot_batch(self):
+        """Test that plot_batch writes a page or a file per group and leaves no figures open."""
+        import matplotlib.pyplot as plt
+        bl = benfordslaw(pos='first_two', method='mad')
+        self.assertRaises(ValueError, bl.plot_batch, 'charts.pdf')
+        bl.fit_groups(self.df, value_col='value', by='group')
+        n_figures = len(plt.get_fignums())
+        with tempfile.TemporaryDirectory() as tmpdir:
+            paths = bl.plot_batch(os.path.join(tmpdir, 'group_{}.png'))
+            assert paths == [os.path.join(tmpdir, f'group_{i}.png') for i in range(3)]
+            assert all(os.path.getsize(path) > 0 for path in paths)
+            paths = bl.plot_batch(os.path.join(tmpdir, 'charts.pdf'), titles=['a', 'b', 'c'])
+            with open(paths[0], 'rb') as f:
+                assert b'/Count 3' in f.read()
+            self.assertRaises(ValueError, bl.plot_batch, os.path.join(tmpdir, 'charts.png'))
+        assert len(plt.get_fignums()) == n_figures
+
+    def test_plot_batch_unique_names(self):
+        """Test that groups with the same file name do not overwrite each other."""
+        counts = pd.DataFrame(np.arange(1, 37).reshape(4, 9), index=['a/b', 'a_b', 'c', 'a_b_1'])
+        with tempfile.TemporaryDirectory() as tmpdir:
+            paths = benfordslaw().plot_batch(os.path.join(tmpdir, '{}.png'), counts=counts)
+            assert [os.path.basename(path) for path in paths] == ['a_b_0.png', 'a_b_1_1.png', 'c.png', 'a_b_1.png']
+            assert sorted(os.listdir(tmpdir)) == sorted(os.path.basename(path) for path in paths)
+
+    def test_plot_grid(self):
+        """Test that plot_grid draws the groups sorted on Excess MAD in one figure."""
+        import matplotlib.pyplot as plt
+        df = self.df.assign(group=np.arange(6000) % 7)
+        bl = benfordslaw()
+        results = bl.fit_groups(df, value_col='value', by='group')
+        fig, axes = bl.plot_grid(results, ncols=3, show=False)
+        assert axes.shape == (3, 3)
+        order = results['excess_mad'].sort_values(ascending=False).index
+        assert [ax.get_title().split('\n')[0] for ax in axes.flat[:7]] == [str(group) for group in order]
+        assert all(len(ax.collections) == 1 and ax.get_legend() is None for ax in axes.flat[:7])
+        assert not any(ax.axison for ax in axes.flat[7:])
+        # The bars are the percentages of the group
+        heights = axes[0, 0].collections[0].get_paths()[0].vertices[1, 1]
+        assert np.isclose(heights, bl.counts_groups.loc[order[0]].iloc[0] / results.loc[order[0], 'N'] * 100)
+        plt.close(fig)
+
+        # A selection of the groups
+        fig, axes = bl.plot_grid(results.head(2), ncols=2, show=False)
+        assert axes.shape == (1, 2)
+        plt.close(fig)
+
+
+class TestExampleCache(unittest.TestCase):
+    def setUp(self):
+        self.df = pd.DataFrame({'candidate': ['a', 'b'] * 500, 'votes': np.arange(1000)})
+
+    def test_offline(self):
+        """Test that a cached dataset is read without the network and that a missing dataset raises in offline mode."""
+        bl = benfordslaw()
+        with tempfile.TemporaryDirectory() as tmpdir:
+            self.assertRaises(FileNotFoundError, bl.import_example, data='elections_usa', offline=True, cache_dir=tmpdir)
+            _write_cache(self.df, _get_cache_path('elections_usa', None, ',', tmpdir))
+            assert bl.import_example(data='elections_usa', offline=True, cache_dir=tmpdir).equals(self.df)
+            # Datasets from a url are cached under the url
+            self.assertRaises(FileNotFoundError, bl.import_example, url='https://example.com/data.csv', offline=True, cache_dir=tmpdir)
+
+    def test_checksum(self):
+        """Test that a corrupted cache is removed."""
+        bl = benfordslaw()
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = _get_cache_path('elections_usa', None, ',', tmpdir)
+            _write_cache(self.df, path)
+            filename = [name for name in os.listdir(tmpdir) if not name.endswith('.json')][0]
+            with open(os.path.join(tmpdir, filename), 'r+b') as f:
+                f.seek(100)
+                f.write(b'corrupted')
+            self.assertRaises(FileNotFoundError, bl.import_example, data='elections_usa', offline=True, cache_dir=tmpdir)
+            assert os.listdir(tmpdir) == []
+
+    def test_npz(self):
+        """Test the cache without pyarrow, which is stored as npz and read without pickle."""
+        df = self.df.assign(candidate=self.df['candidate'].where(self.df['votes'] > 0, None), share=self.df['votes'] / 1000)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = _get_cache_path('elections_usa', None, ',', tmpdir)
+            _write_cache(df, path, fmt='npz')
+            assert sorted(os.listdir(tmpdir)) == ['elections_usa.json', 'elections_usa.npz']
+            out = benfordslaw().import_example(data='elections_usa', offline=True, cache_dir=tmpdir)
+            assert out.equals(df) and out['candidate'].isna().sum() == 1
+
+
 if __name__ == '__main__':
     unittest.main()